@@ -1,3 +1,21 @@
-from .pipeline import procesar_video
+# Las importaciones son diferidas: torch, ultralytics y cv2 solo se cargan
+# cuando se usa algo del paquete, no al hacer `import detector`.
+_exportados = {
+    'procesar_video': ('.pipeline', 'procesar_video'),
+    'DetectorAsincrono': ('.pipeline', 'DetectorAsincrono'),
+    'ServicioDetector': ('.daemon', 'ServicioDetector'),
+    'enviar_tarea': ('.daemon', 'enviar_tarea'),
+    'ServidorInferencia': ('.servidor', 'ServidorInferencia'),
+}
 
-__all__ = ['procesar_video']
\ No newline at end of file
+__all__ = list(_exportados)
+
+
+def __getattr__(nombre):
+    if nombre not in _exportados:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    from importlib import import_module
+    modulo, atributo = _exportados[nombre]
+    valor = getattr(import_module(modulo, __name__), atributo)
+    globals()[nombre] = valor
+    return valor
@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import math
+import time
+
+import aiohttp
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) por el método del rango más cercano"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, math.ceil(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+async def generar_carga(url, imagen_path, concurrencia=8, peticiones=200, ocr=True):
+    """
+    Envía la misma imagen al servidor desde varios clientes concurrentes.
+
+    Args:
+        url (str): URL base del servidor, por ejemplo http://127.0.0.1:8080.
+        imagen_path (str): Imagen (jpg/png) que se envía en cada petición.
+        concurrencia (int, optional): Clientes simultáneos. Default es 8.
+        peticiones (int, optional): Total de peticiones a enviar. Default es 200.
+        ocr (bool, optional): Si es False pide al servidor que no ejecute OCR. Default es True.
+
+    Returns:
+        dict: Rendimiento (peticiones/s) y latencias en ms (p50, p95, p99, max).
+    """
+    with open(imagen_path, "rb") as f:
+        datos = f.read()
+
+    endpoint = f"{url.rstrip('/')}/detectar" + ("" if ocr else "?ocr=0")
+    latencias = []
+    errores = 0
+    restantes = peticiones
+
+    async def cliente(session):
+        nonlocal errores, restantes
+        while restantes > 0:
+            restantes -= 1
+            start_time = time.perf_counter()
+            try:
+                async with session.post(endpoint, data=datos,
+                                        headers={'Content-Type': 'application/octet-stream'}) as resp:
+                    await resp.read()
+                    if resp.status != 200:
+                        errores += 1
+                        continue
+            except aiohttp.ClientError:
+                errores += 1
+                continue
+            latencias.append((time.perf_counter() - start_time) * 1000)
+
+    start_time = time.perf_counter()
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(cliente(session) for _ in range(concurrencia)))
+    duracion = time.perf_counter() - start_time
+
+    return {
+        'peticiones': peticiones,
+        'exitosas': len(latencias),
+        'errores': errores,
+        'duracion_s': duracion,
+        'rendimiento_rps': len(latencias) / duracion if duracion > 0 else 0.0,
+        'p50_ms': percentil(latencias, 50),
+        'p95_ms': percentil(latencias, 95),
+        'p99_ms': percentil(latencias, 99),
+        'max_ms': max(latencias) if latencias else 0.0,
+    }
+
+
+def mostrar_resultados(resultados):
+    print(f"\n📊 RESULTADOS DE CARGA:")
+    print(f"Peticiones: {resultados['exitosas']}/{resultados['peticiones']} (errores: {resultados['errores']})")
+    print(f"Duración: {resultados['duracion_s']:.2f}s")
+    print(f"Rendimiento: {resultados['rendimiento_rps']:.1f} peticiones/s")
+    print(f"Latencia p50: {resultados['p50_ms']:.1f}ms | p95: {resultados['p95_ms']:.1f}ms | "
+          f"p99: {resultados['p99_ms']:.1f}ms | max: {resultados['max_ms']:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generador de carga para el servidor de inferencia")
+    parser.add_argument("imagen")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--peticiones", type=int, default=200)
+    parser.add_argument("--sin-ocr", action="store_true")
+    args = parser.parse_args()
+
+    mostrar_resultados(asyncio.run(generar_carga(
+        args.url, args.imagen, args.concurrencia, args.peticiones, ocr=not args.sin_ocr)))
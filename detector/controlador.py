@@ -0,0 +1,180 @@
+import threading
+import time
+from collections import deque
+
+# Cada paso degrada una perilla más. Se aplican en orden al subir de nivel
+# y se revierten en orden inverso al bajar. El umbral de placas va al final:
+# el modelo de placas corre igual sobre cada auto, solo se guardan menos
+# placas, así que casi no reduce la carga y sí pierde lecturas.
+PASOS_DEGRADACION = [
+    {'ocr': False},
+    {'intervalo_muestreo': 8},
+    {'imgsz': 480},
+    {'intervalo_muestreo': 12},
+    {'imgsz': 320},
+    {'conf_placas': 0.5},
+    {'conf_placas': 0.65},
+]
+
+
+class ControladorAdaptativo:
+    def __init__(self, detector, lag_objetivo_ms=500, intervalo_s=1.0, espera_s=3.0, ventana_s=3.0,
+                 ciclos_estables=5, pasos=PASOS_DEGRADACION):
+        """
+        Ajusta calidad/velocidad del DetectorAsincrono según el atraso y las colas.
+
+        Args:
+            detector (DetectorAsincrono): Pipeline a controlar.
+            lag_objetivo_ms (float, optional): Atraso máximo deseado entre que un frame entra a la cola y termina su proceso. Default es 500.
+            intervalo_s (float, optional): Segundos entre evaluaciones. Default es 1.0.
+            espera_s (float, optional): Tiempo mínimo entre cambios para ver el efecto del anterior. Default es 3.0.
+            ventana_s (float, optional): Segundos hacia atrás que se consideran para medir el atraso. Default es 3.0.
+            ciclos_estables (int, optional): Evaluaciones holgadas seguidas antes de recuperar calidad. Default es 5.
+            pasos (list, optional): Escalera de degradación. Default es PASOS_DEGRADACION. Los pasos
+                que no cambian nada (perilla no disponible o ya en ese valor) se descartan.
+        """
+        self.detector = detector
+        self.lag_objetivo_ms = lag_objetivo_ms
+        self.intervalo_s = intervalo_s
+        self.espera_s = espera_s
+        self.ventana_s = ventana_s
+        self.ciclos_estables = ciclos_estables
+
+        self.base = self.leer_perillas()  # Configuración de calidad completa
+        self.pasos = self.pasos_efectivos(pasos)
+        self.nivel = 0
+        self.ultimo_cambio = 0.0
+        self.holgados = 0
+        self.historial = deque(maxlen=1000)  # Todas las decisiones (incluye 'mantener')
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def leer_perillas(self):
+        d = self.detector
+        return {
+            'intervalo_muestreo': d.intervalo_muestreo,
+            'imgsz': d.detector_vehiculos.imgsz,
+            'conf_placas': d.detector_placas.conf_threshold if d.detector_placas else None,
+            'ocr': d.ocr_activo,
+        }
+
+    @staticmethod
+    def combinar(perilla, actual, valor):
+        """Valor de una perilla tras aplicar un paso; un paso nunca mejora la calidad"""
+        if perilla == 'ocr':
+            return actual and valor
+        if perilla == 'imgsz':
+            return min(actual, valor)  # Nunca sube la resolución
+        return max(actual, valor)  # Nunca baja el muestreo ni el umbral
+
+    def pasos_efectivos(self, pasos):
+        """Quita de la escalera las perillas no disponibles y los pasos que no cambian nada"""
+        efectivos = []
+        perillas = dict(self.base)
+        for paso in pasos:
+            cambios = {}
+            for perilla, valor in paso.items():
+                if perillas.get(perilla) is None:
+                    continue  # Por ejemplo conf_placas sin detector de placas
+                nuevo = self.combinar(perilla, perillas[perilla], valor)
+                if nuevo != perillas[perilla]:
+                    cambios[perilla] = nuevo
+            if cambios:
+                perillas.update(cambios)
+                efectivos.append(cambios)
+        return efectivos
+
+    def perillas_nivel(self, nivel):
+        """Configuración resultante de aplicar los primeros `nivel` pasos sobre la base"""
+        perillas = dict(self.base)
+        for paso in self.pasos[:nivel]:
+            perillas.update(paso)
+        return perillas
+
+    def aplicar(self, perillas):
+        d = self.detector
+        d.intervalo_muestreo = perillas['intervalo_muestreo']
+        d.detector_vehiculos.imgsz = perillas['imgsz']
+        if d.detector_placas:
+            d.detector_placas.conf_threshold = perillas['conf_placas']
+        d.ocr_activo = perillas['ocr']
+
+    def medir(self):
+        """Atraso reciente, llenado de colas, tiempos por etapa y utilización de la detección de vehículos"""
+        d = self.detector
+        desde = time.time() - self.ventana_s
+        lags = [lag for tiempo, lag in list(d.lags) if tiempo >= desde]
+        tiempos = list(d.tiempos_procesamiento)
+        tiempo_deteccion = sum(tiempos) / len(tiempos) if tiempos else 0.0
+        # Tiempo disponible por frame muestreado según el ritmo del video
+        presupuesto = d.intervalo_muestreo * d.frame_time_ms if d.frame_time_ms else None
+        tiempos_placas = list(d.tiempos_placas)
+        tiempos_ocr = list(d.tiempos_ocr)
+        return {
+            'lag_ms': max(lags) if lags else 0.0,
+            'cola_frames': d.frame_queue.qsize() / d.frame_queue.maxsize,
+            'cola_placas': d.placa_queue.qsize() / d.placa_queue.maxsize,
+            'deteccion_ms': tiempo_deteccion,
+            'placas_ms': sum(tiempos_placas) / len(tiempos_placas) if tiempos_placas else 0.0,
+            'ocr_ms': sum(tiempos_ocr) / len(tiempos_ocr) if tiempos_ocr else 0.0,
+            'utilizacion': tiempo_deteccion / presupuesto if presupuesto else 0.0,
+        }
+
+    def evaluar(self):
+        """Una evaluación del controlador: decide subir, bajar o mantener el nivel"""
+        metricas = self.medir()
+        ahora = time.time()
+
+        saturado = (metricas['lag_ms'] > self.lag_objetivo_ms or
+                    metricas['cola_frames'] >= 0.8 or
+                    metricas['cola_placas'] >= 0.8 or
+                    metricas['utilizacion'] > 1.0)
+        holgado = (metricas['lag_ms'] < self.lag_objetivo_ms * 0.5 and
+                   metricas['cola_frames'] < 0.3 and
+                   metricas['cola_placas'] < 0.3 and
+                   metricas['utilizacion'] < 0.6)
+        self.holgados = self.holgados + 1 if holgado else 0
+
+        decision = 'mantener'
+        if ahora - self.ultimo_cambio >= self.espera_s:
+            if saturado and self.nivel < len(self.pasos):
+                decision = 'degradar'
+                self.nivel += 1
+            elif self.holgados >= self.ciclos_estables and self.nivel > 0:
+                decision = 'recuperar'
+                self.nivel -= 1
+                self.holgados = 0
+
+        perillas = self.perillas_nivel(self.nivel)
+        if decision != 'mantener':
+            self.aplicar(perillas)
+            self.ultimo_cambio = ahora
+            conf_str = f"conf placas {perillas['conf_placas']} | " if perillas['conf_placas'] is not None else ""
+            print(f"🎛️ {decision.upper()} → nivel {self.nivel}: "
+                  f"muestreo 1/{perillas['intervalo_muestreo']} | imgsz {perillas['imgsz']} | "
+                  f"{conf_str}OCR {'sí' if self.detector.ocr_activo else 'no'} "
+                  f"(lag {metricas['lag_ms']:.0f}ms, colas {metricas['cola_frames']:.0%}/{metricas['cola_placas']:.0%}, "
+                  f"vehículos {metricas['deteccion_ms']:.0f}ms, placas {metricas['placas_ms']:.0f}ms, "
+                  f"OCR {metricas['ocr_ms']:.0f}ms)")
+
+        registro = {'tiempo': ahora, 'decision': decision, 'nivel': self.nivel}
+        registro.update(metricas)
+        self.historial.append(registro)
+        return decision
+
+    def iniciar(self):
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(timeout=3)
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo_s):
+            try:
+                self.evaluar()
+            except Exception as e:
+                print(f"Error en controlador adaptativo: {e}")
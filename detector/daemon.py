@@ -0,0 +1,178 @@
+import json
+import os
+import secrets
+import time
+from multiprocessing.connection import Client, Listener
+
+DIRECCION_POR_DEFECTO = ('127.0.0.1', 6001)
+ARCHIVO_CLAVE = os.path.join(os.path.expanduser('~'), '.detectar-autos-placas', 'daemon.key')
+VARIABLE_CLAVE = 'DETECTOR_DAEMON_CLAVE'  # Alternativa al archivo de clave
+MAX_MENSAJE = 1024 * 1024  # Bytes máximos de una tarea recibida
+
+
+def obtener_clave(crear=False):
+    """
+    Clave compartida entre el servicio y sus clientes.
+
+    Se toma de la variable de entorno DETECTOR_DAEMON_CLAVE o de ARCHIVO_CLAVE. Si no
+    existe y crear es True, se genera una clave aleatoria en un archivo solo legible
+    por el dueño (0600).
+    """
+    clave_env = os.environ.get(VARIABLE_CLAVE)
+    if clave_env:
+        return clave_env.encode()
+
+    if crear and not os.path.exists(ARCHIVO_CLAVE):
+        os.makedirs(os.path.dirname(ARCHIVO_CLAVE), mode=0o700, exist_ok=True)
+        try:
+            fd = os.open(ARCHIVO_CLAVE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(secrets.token_bytes(32))
+            print(f"🔑 Clave del servicio generada en {ARCHIVO_CLAVE}")
+        except FileExistsError:
+            pass  # Otro proceso la creó al mismo tiempo
+
+    if not os.path.exists(ARCHIVO_CLAVE):
+        raise RuntimeError(f"No hay clave del servicio: inicia el servicio o define {VARIABLE_CLAVE}")
+    if os.stat(ARCHIVO_CLAVE).st_mode & 0o077:
+        raise RuntimeError(f"{ARCHIVO_CLAVE} es accesible por otros usuarios; usa chmod 600")
+    with open(ARCHIVO_CLAVE, 'rb') as f:
+        return f.read()
+
+
+def _enviar(conn, mensaje):
+    conn.send_bytes(json.dumps(mensaje).encode('utf-8'))
+
+
+def _recibir(conn, max_bytes=None):
+    # JSON en lugar de conn.send/recv para no deserializar pickle de terceros
+    return json.loads(conn.recv_bytes(max_bytes).decode('utf-8'))
+
+
+class ServicioDetector:
+    def __init__(self, modelo_vehiculos_path, modelo_placas_path=None, ocr=False, calentar=True,
+                 direccion=DIRECCION_POR_DEFECTO, clave=None):
+        """
+        Proceso de larga duración que mantiene los modelos cargados entre tareas.
+
+        Args:
+            modelo_vehiculos_path (str): Ruta al modelo para detección de vehículos.
+            modelo_placas_path (str, optional): Ruta al modelo para detección de placas. Default es None.
+            ocr (bool, optional): Si es True también mantiene PaddleOCR cargado. Default es False.
+            calentar (bool, optional): Si es True hace una inferencia de prueba al iniciar. Default es True.
+            direccion (tuple, optional): (host, puerto) donde escucha el servicio.
+            clave (bytes, optional): Clave compartida con los clientes. Default es obtener_clave(crear=True).
+        """
+        start_time = time.time()
+        
+        self.direccion = direccion
+        self.clave = clave if clave is not None else obtener_clave(crear=True)
+        self.activo = False
+        self.tareas_atendidas = 0
+        
+        # Import diferido: los clientes (enviar_tarea) no necesitan cv2 ni los modelos
+        from .pipeline import DetectorAsincrono
+        self.detector = DetectorAsincrono(modelo_vehiculos_path, modelo_placas_path, calentar=calentar)
+        
+        self.lector = None
+        if ocr:
+            from .lector_placas import LectorPlacasPaddle
+            self.lector = LectorPlacasPaddle()
+            if calentar:
+                self.lector.calentar()
+        
+        self.tiempo_arranque = (time.time() - start_time) * 1000
+        print(f"⏱️ Servicio listo en {self.tiempo_arranque:.0f}ms")
+
+    def atender(self, tarea):
+        """
+        Ejecuta una tarea y devuelve la respuesta para el cliente.
+
+        Tareas soportadas (campo 'tipo'): 'video', 'ocr', 'estado' y 'detener'.
+        """
+        if not isinstance(tarea, dict):
+            return {'ok': False, 'error': 'La tarea debe ser un objeto JSON'}
+        tipo = tarea.get('tipo')
+        start_time = time.time()
+        
+        if tipo == 'video':
+            self.detector.reiniciar()
+            ok = self.detector.procesar_video(tarea['video_path'], mostrar=tarea.get('mostrar', False))
+            # crops/ y placas/ quedan en el directorio de trabajo del servicio
+            respuesta = {'ok': ok, 'estadisticas': self.detector.resumen(),
+                         'carpeta_placas': os.path.abspath('placas')}
+            if not ok:
+                respuesta['error'] = f"No se pudo abrir el video: {tarea['video_path']}"
+        elif tipo == 'ocr':
+            if self.lector is None:
+                return {'ok': False, 'error': 'Servicio iniciado sin OCR'}
+            resultados = self.lector.procesar_carpeta_placas(tarea['carpeta_placas'], tarea.get('debug', False))
+            respuesta = {'ok': True, 'resultados': resultados}
+        elif tipo == 'estado':
+            respuesta = {'ok': True, 'estado': self.estado()}
+        elif tipo == 'detener':
+            self.activo = False
+            respuesta = {'ok': True}
+        else:
+            return {'ok': False, 'error': f"Tarea desconocida: {tipo}"}
+        
+        self.tareas_atendidas += 1
+        respuesta['tiempo_tarea_ms'] = (time.time() - start_time) * 1000
+        return respuesta
+
+    def estado(self):
+        """Métricas de arranque y uso del servicio"""
+        return {
+            'arranque_ms': self.tiempo_arranque,
+            'carga_vehiculos_ms': self.detector.detector_vehiculos.tiempo_carga,
+            'carga_placas_ms': self.detector.detector_placas.tiempo_carga if self.detector.detector_placas else None,
+            'calentamiento_ms': self.detector.metricas_arranque['calentamiento_ms'],
+            'carga_ocr_ms': self.lector.tiempo_carga if self.lector else None,
+            'tareas_atendidas': self.tareas_atendidas,
+        }
+
+    def ejecutar(self):
+        """Atiende tareas una por una hasta recibir 'detener'"""
+        self.activo = True
+        with Listener(self.direccion, authkey=self.clave) as listener:
+            print(f"🛰️ Servicio escuchando en {self.direccion[0]}:{self.direccion[1]}")
+            while self.activo:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"Error aceptando conexión: {e}")
+                    continue
+                
+                with conn:
+                    try:
+                        tarea = _recibir(conn, MAX_MENSAJE)
+                        if not isinstance(tarea, dict):
+                            raise ValueError("La tarea debe ser un objeto JSON")
+                        print(f"📥 Tarea recibida: {tarea.get('tipo')}")
+                        _enviar(conn, self.atender(tarea))
+                    except Exception as e:
+                        print(f"Error atendiendo tarea: {e}")
+                        try:
+                            _enviar(conn, {'ok': False, 'error': str(e)})
+                        except Exception:
+                            pass
+        
+        print("Servicio detenido")
+
+
+def enviar_tarea(tarea, direccion=DIRECCION_POR_DEFECTO, clave=None):
+    """Envía una tarea al servicio en ejecución y espera su respuesta"""
+    if clave is None:
+        clave = obtener_clave()
+    with Client(direccion, authkey=clave) as conn:
+        _enviar(conn, tarea)
+        return _recibir(conn)
+
+
+def iniciar_servicio(modelo_vehiculos_path, modelo_placas_path=None, ocr=False, calentar=True,
+                     direccion=DIRECCION_POR_DEFECTO):
+    """Función simple para levantar el servicio y bloquear hasta que se detenga"""
+    servicio = ServicioDetector(modelo_vehiculos_path, modelo_placas_path, ocr=ocr,
+                                calentar=calentar, direccion=direccion)
+    servicio.ejecutar()
+    return servicio
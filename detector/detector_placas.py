@@ -1,45 +1,93 @@
-import cv2
-import torch
-from ultralytics import YOLO
+import threading
+import time
+
+import numpy as np
 
 
 class DetectorPlacas:
-    def __init__(self, modelo_placas_path):
-        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        self.model_placas = YOLO(modelo_placas_path).to(self.device)
+    def __init__(self, modelo_placas_path, device=None, carga_diferida=False):
+        self._device = device  # None: se elige al cargar el modelo
+        self.modelo_placas_path = modelo_placas_path
+        self._model_placas = None
+        self._carga_lock = threading.Lock()
+        self.tiempo_carga = None  # ms que tomó cargar el modelo
+        self.tiempo_calentamiento = None  # ms de la inferencia de calentamiento
         self.conf_threshold = 0.35  # Umbral de confianza para evitar objetos que el modelo cree que son placas pero con muy poca seguridad
-        
+        if not carga_diferida:
+            self.cargar()
+
+    @property
+    def device(self):
+        """Dispositivo de inferencia; si no se indicó se elige en el primer uso (importa torch)"""
+        if self._device is None:
+            import torch
+            self._device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        return self._device
+
+    @property
+    def model_placas(self):
+        """Modelo YOLO de placas, se carga en el primer uso si se pidió carga diferida"""
+        if self._model_placas is None:
+            self.cargar()
+        return self._model_placas
+
+    def cargar(self):
+        """Carga el modelo de placas una sola vez (seguro entre hilos)"""
+        with self._carga_lock:
+            if self._model_placas is None:
+                from ultralytics import YOLO
+                start_time = time.time()
+                self._model_placas = YOLO(self.modelo_placas_path).to(self.device)
+                self.tiempo_carga = (time.time() - start_time) * 1000
+        return self._model_placas
+
+    def calentar(self, tam=320):
+        """Inferencia sobre un crop vacío para que la primera placa real no pague la inicialización"""
+        crop_vacio = np.zeros((tam, tam, 3), dtype=np.uint8)
+        self.cargar()
+        start_time = time.time()
+        self.detectar_placa(crop_vacio)
+        self.tiempo_calentamiento = (time.time() - start_time) * 1000
+        return self.tiempo_calentamiento
+
     def detectar_placa(self, crop_auto):
+        return self.detectar_placas_lote([crop_auto])[0]
+
+    def detectar_placas_lote(self, crops_autos):
+        """Detecta placas en varios crops con una sola llamada al modelo"""
+        placas = [None] * len(crops_autos)
         try:
-            # Redimensionar crop para mejor detección
-            h, w = crop_auto.shape[:2]
-            if h < 100 or w < 100:
-                return None
+            # Descartar crops muy pequeños para detectar placa
+            indices = [i for i, crop in enumerate(crops_autos)
+                       if crop.shape[0] >= 100 and crop.shape[1] >= 100]
+            if not indices:
+                return placas
                 
             # Detección de placa
-            results = self.model_placas(
-                crop_auto,
+            resultados = self.model_placas(
+                [crops_autos[i] for i in indices],
                 verbose=False,
                 conf=self.conf_threshold,
                 iou=0.4,
                 max_det=1,  # Maximo 1 detecciones por crop
                 half=True if self.device == 'cuda' else False,
                 device=self.device
-            )[0]
+            )
             
-            if len(results.boxes) > 0:
-                box = results.boxes.xyxy[0].cpu().numpy()
-                conf = float(results.boxes.conf[0].cpu().numpy())
-                x1, y1, x2, y2 = map(int, box)
-
-                if x2 > x1 and y2 > y1:
-                    return {
-                        'box': (x1, y1, x2, y2),
-                        'conf': conf,
-                        'crop': crop_auto[y1:y2, x1:x2]
-                    }
+            for i, results in zip(indices, resultados):
+                if len(results.boxes) > 0:
+                    box = results.boxes.xyxy[0].cpu().numpy()
+                    conf = float(results.boxes.conf[0].cpu().numpy())
+                    x1, y1, x2, y2 = map(int, box)
+
+                    if x2 > x1 and y2 > y1:
+                        placas[i] = {
+                            'box': (x1, y1, x2, y2),
+                            'conf': conf,
+                            'crop': crops_autos[i][y1:y2, x1:x2]
+                        }
                     
         except Exception as e:
             print(f"Error detectando placa: {e}")
             
-        return None
\ No newline at end of file
+        return placas
@@ -1,12 +1,19 @@
-import torch
-from ultralytics import YOLO
+import threading
+import time
+
+import numpy as np
 
 
 class DetectorVehiculos:
-    def __init__(self, modelo_path, device='cpu'):
-        self.device = device
-        self.model = YOLO(modelo_path).to(self.device)
+    def __init__(self, modelo_path, device='cpu', carga_diferida=False, roi=None):
+        self.modelo_path = modelo_path
+        self._device = device  # None: se elige al cargar el modelo
+        self._model = None
+        self._carga_lock = threading.Lock()
+        self.tiempo_carga = None  # ms que tomó cargar el modelo
+        self.tiempo_calentamiento = None  # ms de la inferencia de calentamiento
         self.conf_threshold = 0.4
+        self.imgsz = 640  # Resolución de inferencia
         self.min_box_size = 100 
         self.min_auto_size = 100
         self.colores = {
@@ -14,43 +21,145 @@ class DetectorVehiculos:
             'bus': (255, 0, 255),
             'truck': (0, 165, 255),
         }
+        self.clases = tuple(self.colores)  # Índices usados en los arrays de detección
+        self._tabla = None
+        self.roi = roi  # (x1, y1, x2, y2) zona de interés; None usa el frame completo
+        if not carga_diferida:
+            self.cargar()
+
+    @property
+    def device(self):
+        """Dispositivo de inferencia; si no se indicó se elige en el primer uso (importa torch)"""
+        if self._device is None:
+            import torch
+            self._device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        return self._device
+
+    @property
+    def model(self):
+        """Modelo YOLO, se carga en el primer uso si se pidió carga diferida"""
+        if self._model is None:
+            self.cargar()
+        return self._model
+
+    def cargar(self):
+        """Carga el modelo YOLO una sola vez (seguro entre hilos)"""
+        with self._carga_lock:
+            if self._model is None:
+                from ultralytics import YOLO
+                start_time = time.time()
+                self._model = YOLO(self.modelo_path).to(self.device)
+                self.tiempo_carga = (time.time() - start_time) * 1000
+        return self._model
+
+    def calentar(self, tam=640):
+        """Inferencia sobre un frame vacío para que el primer frame real no pague la inicialización"""
+        frame_vacio = np.zeros((tam, tam, 3), dtype=np.uint8)
+        self.cargar()
+        start_time = time.time()
+        self.detectar(frame_vacio, -1)
+        self.tiempo_calentamiento = (time.time() - start_time) * 1000
+        return self.tiempo_calentamiento
 
     def detectar(self, frame, frame_idx):
-        results = self.model(
-            frame,
+        return self.a_diccionarios(self.detectar_arrays(frame), frame_idx)
+
+    def detectar_arrays(self, frame):
+        """Igual que detectar pero devuelve arrays (ver _extraer_arrays) en vez de diccionarios"""
+        return self.detectar_arrays_lote([frame])[0]
+
+    def detectar_lote(self, frames, frame_idxs):
+        """Detecta vehículos en varios frames con una sola llamada al modelo"""
+        return [self.a_diccionarios(arrays, frame_idx)
+                for arrays, frame_idx in zip(self.detectar_arrays_lote(frames), frame_idxs)]
+
+    def detectar_arrays_lote(self, frames):
+        if not frames:
+            return []
+
+        resultados = self.model(
+            frames,
             verbose=False,
             classes=[2, 5, 7],  # car, bus, truck
             conf=self.conf_threshold,
             iou=0.5,
+            imgsz=self.imgsz,
             half=True if self.device == 'cuda' else False,
             device=self.device
-        )[0]
+        )
+
+        return [self._extraer_arrays(results) for results in resultados]
+
+    def _tabla_clases(self, names):
+        """Array id_modelo -> índice en self.clases (-1 si no es un vehículo de interés)"""
+        if self._tabla is None:
+            tabla = np.full(max(names) + 1, -1, dtype=np.int64)
+            for cls_id, nombre in names.items():
+                if nombre in self.colores:
+                    tabla[cls_id] = self.clases.index(nombre)
+            self._tabla = tabla
+        return self._tabla
 
+    def _extraer_arrays(self, results):
+        """
+        Filtra todas las cajas de un resultado con operaciones de arrays.
+
+        Returns:
+            dict: 'boxes' (N, 4) int, 'clases' (N,) índice en self.clases,
+                  'conf' (N,) float e 'indices' (N,) posición original en el resultado.
+        """
+        if len(results.boxes) == 0:
+            return {
+                'boxes': np.empty((0, 4), dtype=np.int64),
+                'clases': np.empty(0, dtype=np.int64),
+                'conf': np.empty(0, dtype=np.float32),
+                'indices': np.empty(0, dtype=np.int64),
+            }
+
+        boxes = results.boxes.xyxy.cpu().numpy().astype(np.int64)
+        cls_ids = results.boxes.cls.cpu().numpy().astype(np.int64)
+        conf = results.boxes.conf.cpu().numpy()
+
+        # Mapeo de clases del modelo a las de interés
+        clases = self._tabla_clases(results.names)[cls_ids]
+
+        # Filtro de tamaño
+        ancho = boxes[:, 2] - boxes[:, 0]
+        alto = boxes[:, 3] - boxes[:, 1]
+        validas = (clases >= 0) & (ancho >= self.min_box_size) & (alto >= self.min_box_size)
+
+        # Filtro por zona de interés (centro de la caja dentro del ROI)
+        if self.roi is not None:
+            rx1, ry1, rx2, ry2 = self.roi
+            cx = (boxes[:, 0] + boxes[:, 2]) // 2
+            cy = (boxes[:, 1] + boxes[:, 3]) // 2
+            validas &= (cx >= rx1) & (cx < rx2) & (cy >= ry1) & (cy < ry2)
+
+        indices = np.flatnonzero(validas)
+        return {
+            'boxes': boxes[indices],
+            'clases': clases[indices],
+            'conf': conf[indices],
+            'indices': indices,
+        }
+
+    def a_diccionarios(self, arrays, frame_idx):
+        """Convierte el resultado de _extraer_arrays al formato de lista de diccionarios"""
         vehiculos = []
-        if len(results.boxes) > 0:
-            for i, (box, cls_id, conf) in enumerate(zip(results.boxes.xyxy.cpu().numpy(),
-                                                       results.boxes.cls.cpu().numpy(),
-                                                       results.boxes.conf.cpu().numpy())):
-                
-                clase = results.names[int(cls_id)]
-                if clase not in self.colores:
-                    continue
-
-                x1, y1, x2, y2 = map(int, box)
-                
-                # Filtro de tamaño
-                if (x2 - x1) < self.min_box_size or (y2 - y1) < self.min_box_size:
-                    continue
-
-                auto_id = f"{frame_idx}_{i}_{clase}"
-                
-                vehiculo_info = {
-                    'box': (x1, y1, x2, y2),
-                    'clase': clase,
-                    'conf': float(conf),
-                    'frame_idx': frame_idx,
-                    'auto_id': auto_id
-                }
-                vehiculos.append(vehiculo_info)
-
-        return vehiculos
\ No newline at end of file
+        for box, clase_idx, conf, i in zip(arrays['boxes'].tolist(), arrays['clases'].tolist(),
+                                           arrays['conf'].tolist(), arrays['indices'].tolist()):
+            clase = self.clases[clase_idx]
+            vehiculos.append({
+                'box': tuple(box),
+                'clase': clase,
+                'conf': conf,
+                'frame_idx': frame_idx,
+                'auto_id': f"{frame_idx}_{i}_{clase}"
+            })
+        return vehiculos
+
+
+def expandir_cajas(boxes, margin, ancho, alto):
+    """Agrega un margen a cajas (N, 4) y las recorta a los límites del frame"""
+    expandidas = boxes + np.array([-margin, -margin, margin, margin])
+    return np.clip(expandidas, 0, [ancho, alto, ancho, alto])
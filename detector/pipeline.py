@@ -1,6 +1,5 @@
 import cv2
 import numpy as np
-import torch
 import os
 import shutil
 import time
@@ -9,11 +8,26 @@ from queue import Queue, Empty
 from collections import deque
 
 from .detector_placas import DetectorPlacas
-from .detector_vehiculos import DetectorVehiculos
+from .detector_vehiculos import DetectorVehiculos, expandir_cajas
+from .controlador import ControladorAdaptativo
+from .recursos import DirectorioRotativo, MapaAcotado, Vigilante
 
+# Límites de estado para ejecuciones largas (streams 24/7)
+LIMITES_CONTINUO = {
+    'max_frames_lentos': 1000,  # Frames lentos recordados
+    'max_placas_detectadas': 500,  # Placas pendientes de mostrar
+    'ttl_placas_s': 30,  # Segundos que una placa puede quedar sin mostrarse
+    'max_disco_crops_mb': 1024,  # Cuota de crops/ (solo en modo continuo)
+    'max_disco_placas_mb': 256,  # Cuota de placas/ (solo en modo continuo)
+    'intervalo_vigilancia_s': 60,  # Segundos entre reportes de memoria y colas
+}
+
+FPS_POR_DEFECTO = 30  # Ritmo asumido cuando la fuente no informa FPS
 
 class DetectorAsincrono:
-    def __init__(self, modelo_vehiculos_path, modelo_placas_path=None):
+    def __init__(self, modelo_vehiculos_path, modelo_placas_path=None, carga_diferida=False, calentar=False,
+                 modo_continuo=False, limites=None, ocr_en_vivo=False, adaptativo=False, lag_objetivo_ms=500,
+                 device=None, roi=None):
         
         """
         Inicializa el detector asincrónico de vehículos y placas.
@@ -21,18 +35,70 @@ class DetectorAsincrono:
         Args:
             modelo_vehiculos_path (str): Ruta al modelo para detección de vehículos.
             modelo_placas_path (str, optional): Ruta al modelo para detección de placas. Default es None.
+            carga_diferida (bool, optional): Si es True los modelos se cargan en su primer uso. Default es False.
+            calentar (bool, optional): Si es True se hace una inferencia de prueba al iniciar. Default es False.
+            modo_continuo (bool, optional): Si es True aplica cuotas de disco y activa el vigilante de memoria. Default es False.
+            limites (dict, optional): Valores que reemplazan a los de LIMITES_CONTINUO.
+            ocr_en_vivo (bool, optional): Si es True lee el texto de cada placa con PaddleOCR durante el video. Default es False.
+            adaptativo (bool, optional): Si es True un controlador ajusta muestreo, resolución, umbral de placas y OCR según la carga. Default es False.
+            lag_objetivo_ms (float, optional): Atraso máximo que intenta mantener el controlador adaptativo. Default es 500.
+            device (str, optional): 'cuda' o 'cpu'. Default es None (se elige según torch al cargar los modelos).
+            roi (tuple, optional): Zona de interés (x1, y1, x2, y2) en píxeles; solo cuentan los vehículos con centro dentro. Default es None (frame completo).
         """
+        start_time = time.time()
         
-        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        print(f"🖥️ Usando dispositivo: {self.device.upper()}")
+        # Cargar detectores (o solo prepararlos si la carga es diferida, sin importar torch)
+        self.detector_vehiculos = DetectorVehiculos(modelo_vehiculos_path, device, carga_diferida=carga_diferida, roi=roi)
+        self.detector_placas = DetectorPlacas(modelo_placas_path, device, carga_diferida=carga_diferida) if modelo_placas_path else None
+        if not carga_diferida:
+            print(f"🖥️ Usando dispositivo: {self.device.upper()}")
         
-        # Cargar detectores
-        self.detector_vehiculos = DetectorVehiculos(modelo_vehiculos_path, self.device)
-        self.detector_placas = DetectorPlacas(modelo_placas_path) if modelo_placas_path else None
+        # OCR durante el video (opcional)
+        self.lector = None
+        if ocr_en_vivo and self.detector_placas:
+            from .lector_placas import LectorPlacasPaddle
+            self.lector = LectorPlacasPaddle(carga_diferida=carga_diferida)
         
-        # Configuración optimizada
+        # Configuración optimizada (el controlador adaptativo puede cambiarla en vivo)
         self.min_auto_size = 100  # Tamaño mínimo para intentar detectar placa
+        self.intervalo_muestreo = 5  # Se envía a detección 1 de cada N frames
+        self.ocr_activo = self.lector is not None
+        self.frame_time_ms = None
+        
+        # Colores (usar los del detector de vehículos)
+        self.colores = self.detector_vehiculos.colores
+        
+        # Límites para ejecuciones largas
+        self.modo_continuo = modo_continuo
+        self.limites = dict(LIMITES_CONTINUO, **(limites or {}))
+        
+        # Métricas de arranque (ms)
+        self.metricas_arranque = {
+            'inicializacion_ms': None,
+            'calentamiento_ms': None,
+            'primera_deteccion_ms': None,
+        }
+        
+        self.reiniciar()
+        
+        if calentar:
+            self.calentar()
         
+        self.controlador = ControladorAdaptativo(self, lag_objetivo_ms) if adaptativo else None
+        
+        self.metricas_arranque['inicializacion_ms'] = (time.time() - start_time) * 1000
+        print(f"⏱️ Detector listo en {self.metricas_arranque['inicializacion_ms']:.0f}ms")
+    
+    @property
+    def device(self):
+        return self.detector_vehiculos.device
+    
+    def reiniciar(self):
+        """
+        Deja colas, contadores y carpetas de salida en su estado inicial.
+
+        Permite reutilizar los modelos ya cargados para procesar otro video.
+        """
         # Threading para vehículos
         self.frame_queue = Queue(maxsize=5)
         self.detection_queue = Queue(maxsize=10)
@@ -40,16 +106,18 @@ class DetectorAsincrono:
         
         # Threading para placas
         self.placa_queue = Queue(maxsize=10)  # Cola para crops de autos
-        self.placas_detectadas = {}  # auto_id -> placa_info
+        
+        # Trabajo ofrecido a cada cola y descartado por estar llena
+        self.ofrecidos = {'frames': 0, 'placas': 0}
+        self.descartados = {'frames': 0, 'placas': 0}
+        self.placas_detectadas = MapaAcotado(self.limites['max_placas_detectadas'],
+                                             self.limites['ttl_placas_s'])  # auto_id -> placa_info
         self.placas_lock = threading.Lock()
         
         # Detecciones actuales para mostrar
         self.current_detections = []
         self.detection_lock = threading.Lock()
         
-        # Colores (usar los del detector de vehículos)
-        self.colores = self.detector_vehiculos.colores
-        
         # Contadores por tipo de vehículo
         self.contadores_vehiculos = {
             'car': 0, 'bus': 0, 'truck': 0
@@ -61,12 +129,37 @@ class DetectorAsincrono:
         self.placas_encontradas = 0
         self.tiempos_procesamiento = deque(maxlen=10)
         self.tiempos_placas = deque(maxlen=10)
+        self.tiempos_ocr = deque(maxlen=10)
+        self.lags = deque(maxlen=100)  # (tiempo, ms desde que el frame entró a la cola)
+        self.inicio_sesion = time.time()
+        self.metricas_arranque['primera_deteccion_ms'] = None
         
-        # Crear directorios
+        # Crear directorios (con cuota de disco en modo continuo)
         reset_folder('crops')
         reset_folder('placas')
+        self.disco_crops = DirectorioRotativo(
+            'crops', self.limites['max_disco_crops_mb'] if self.modo_continuo else None)
+        self.disco_placas = DirectorioRotativo(
+            'placas', self.limites['max_disco_placas_mb'] if self.modo_continuo else None)
         
-        self.frames_lentos = set()
+        self.frames_lentos = MapaAcotado(self.limites['max_frames_lentos'])
+    
+    def calentar(self):
+        """
+        Carga los modelos y hace una inferencia de prueba en cada uno.
+
+        Returns:
+            float: Tiempo total de calentamiento en ms.
+        """
+        start_time = time.time()
+        self.detector_vehiculos.calentar()
+        if self.detector_placas:
+            self.detector_placas.calentar()
+        if self.lector:
+            self.lector.calentar()
+        self.metricas_arranque['calentamiento_ms'] = (time.time() - start_time) * 1000
+        print(f"🔥 Modelos calentados en {self.metricas_arranque['calentamiento_ms']:.0f}ms")
+        return self.metricas_arranque['calentamiento_ms']
     
     def detectar_placas_thread(self):
         """
@@ -83,7 +176,7 @@ class DetectorAsincrono:
             try:
                 # Obtener crop de auto de la cola
                 auto_data = self.placa_queue.get(timeout=0.1)
-                auto_id, crop_auto, vehiculo_info = auto_data
+                auto_id, crop_auto, vehiculo_info, encolado = auto_data
                 
                 start_time = time.time()
                 
@@ -97,7 +190,14 @@ class DetectorAsincrono:
                     # Guardar crop de placa
                     if placa_result['crop'] is not None:
                         placa_filename = f"placas/placa_{auto_id}_{int(time.time()*1000)}.jpg"
-                        cv2.imwrite(placa_filename, placa_result['crop'])
+                        self.disco_placas.guardar(placa_filename, placa_result['crop'])
+                    
+                    # Leer texto si el OCR en vivo está activo
+                    texto = None
+                    if self.lector and self.ocr_activo:
+                        start_ocr = time.time()
+                        texto = self.lector.leer_placa_con_paddle(self.lector.preprocesar_imagen(placa_result['crop']))
+                        self.tiempos_ocr.append((time.time() - start_ocr) * 1000)
                     
                     # Actualizar registro de placas
                     with self.placas_lock:
@@ -105,13 +205,18 @@ class DetectorAsincrono:
                             'placa_info': placa_result,
                             'vehiculo_info': vehiculo_info,
                             'frames_vivos': 0,
-                            'filename': placa_filename
+                            'filename': placa_filename,
+                            'texto': texto
                         }
 
                         self.placas_encontradas += 1
                     
                     avg_time = sum(self.tiempos_placas) / len(self.tiempos_placas)
-                    print(f"🅿️  Placa detectada en auto {auto_id}: conf={placa_result['conf']:.2f} ({avg_time:.1f}ms)")
+                    texto_str = f" texto='{texto}'" if texto else ""
+                    print(f"🅿️  Placa detectada en auto {auto_id}: conf={placa_result['conf']:.2f}{texto_str} ({avg_time:.1f}ms)")
+                
+                # Atraso de punta a punta: desde que el frame entró a la cola
+                self.lags.append((time.time(), (time.time() - encolado) * 1000))
                 
                 self.placa_queue.task_done()
                 
@@ -133,77 +238,75 @@ class DetectorAsincrono:
         while self.running:
             try:
                 frame_data = self.frame_queue.get(timeout=0.1)
-                frame, frame_idx = frame_data
+                frame, frame_idx, encolado = frame_data
                 
                 start_time = time.time()
                 
                 # Detección de vehículos usando el detector
-                vehiculos = self.detector_vehiculos.detectar(frame, frame_idx)
+                detector = self.detector_vehiculos
+                arrays = detector.detectar_arrays(frame)
+                vehiculos = detector.a_diccionarios(arrays, frame_idx)
                 
                 processing_time = (time.time() - start_time) * 1000
                 self.tiempos_procesamiento.append(processing_time)
                 
                 if processing_time >= 200:
                     with self.detection_lock:
-                        self.frames_lentos.add(frame_idx)
-                    
-                # Procesar resultados para detección de placas
-                for vehiculo in vehiculos:
-                    x1, y1, x2, y2 = vehiculo['box']
-                    clase = vehiculo['clase']
-                    auto_id = vehiculo['auto_id']
-                    
-                    # Guardar crop general
-                    self.guardar_crop_async(frame, (x1, y1, x2, y2), clase, frame_idx)
-                    
-                    # Si es un auto suficientemente grande, enviarlo para detección de placa
-                    if (clase == 'car' and 
-                        (x2-x1) >= self.min_auto_size and 
-                        (y2-y1) >= self.min_auto_size and 
-                        self.detector_placas and 
-                        not self.placa_queue.full()):
-                        
-                        # Expandir crop para mejor detección de placa
-                        margin = 10
-                        h, w = frame.shape[:2]
-                        x1_exp = max(0, x1 - margin)
-                        y1_exp = max(0, y1 - margin)
-                        x2_exp = min(w, x2 + margin)
-                        y2_exp = min(h, y2 + margin)
-                        
-                        crop_auto = frame[y1_exp:y2_exp, x1_exp:x2_exp]
-                        
+                        self.frames_lentos.agregar(frame_idx)
+                
+                # Cálculos sobre todas las cajas a la vez
+                boxes, clases = arrays['boxes'], arrays['clases']
+                h, w = frame.shape[:2]
+                conteo_clases = np.bincount(clases, minlength=len(detector.clases))
+                elegibles = ((clases == detector.clases.index('car')) &
+                             ((boxes[:, 2] - boxes[:, 0]) >= self.min_auto_size) &
+                             ((boxes[:, 3] - boxes[:, 1]) >= self.min_auto_size))
+                
+                # Guardar crops generales (margen de 5px, descartando los muy pequeños)
+                cajas_crop = expandir_cajas(boxes, 5, w, h)
+                grandes = (((cajas_crop[:, 2] - cajas_crop[:, 0]) > 30) &
+                           ((cajas_crop[:, 3] - cajas_crop[:, 1]) > 30))
+                for i in np.flatnonzero(grandes).tolist():
+                    x1, y1, x2, y2 = cajas_crop[i].tolist()
+                    self.guardar_crop_async(frame[y1:y2, x1:x2], vehiculos[i]['clase'], frame_idx)
+                
+                # Autos suficientemente grandes van a detección de placa, con crop expandido
+                if self.detector_placas and elegibles.any():
+                    indices_placas = np.flatnonzero(elegibles)
+                    cajas_placas = expandir_cajas(boxes[indices_placas], 10, w, h)
+                    self.ofrecidos['placas'] += len(indices_placas)
+                    for n, (i, (x1, y1, x2, y2)) in enumerate(zip(indices_placas.tolist(), cajas_placas.tolist())):
+                        if self.placa_queue.full():
+                            self.descartados['placas'] += len(indices_placas) - n
+                            break
+                        crop_auto = frame[y1:y2, x1:x2]
                         if crop_auto.size > 0:
                             try:
-                                self.placa_queue.put_nowait((auto_id, crop_auto, vehiculo))
+                                self.placa_queue.put_nowait((vehiculos[i]['auto_id'], crop_auto, vehiculos[i], encolado))
                             except:
-                                pass  # Cola llena, skip
+                                self.descartados['placas'] += 1  # Cola llena, skip
                 
                 # Actualizar detecciones actuales
                 with self.detection_lock:
+                    if self.metricas_arranque['primera_deteccion_ms'] is None:
+                        self.metricas_arranque['primera_deteccion_ms'] = (time.time() - self.inicio_sesion) * 1000
                     self.current_detections = vehiculos
+                    self.lags.append((time.time(), (time.time() - encolado) * 1000))
                     self.frames_procesados += 1
                     self.vehiculos_detectados += len(vehiculos)
                     
                     # Actualizar contadores por tipo
-                    for vehiculo in vehiculos:
-                        if vehiculo['clase'] in self.contadores_vehiculos:
-                            self.contadores_vehiculos[vehiculo['clase']] += 1
+                    for clase, cantidad in zip(detector.clases, conteo_clases.tolist()):
+                        if clase in self.contadores_vehiculos:
+                            self.contadores_vehiculos[clase] += cantidad
                 
                 # Debug con tipos detectados
                 if vehiculos:
                     avg_time = sum(self.tiempos_procesamiento) / len(self.tiempos_procesamiento)
-                    tipos_detectados = {}
-                    autos_para_placas = 0
-                    
-                    for v in vehiculos:
-                        tipos_detectados[v['clase']] = tipos_detectados.get(v['clase'], 0) + 1
-                        if (v['clase'] == 'car' and 
-                            (v['box'][2]-v['box'][0]) >= self.min_auto_size and 
-                            (v['box'][3]-v['box'][1]) >= self.min_auto_size):
-                            autos_para_placas += 1
+                    autos_para_placas = int(elegibles.sum())
                     
-                    tipos_str = " | ".join([f"{tipo}: {cant}" for tipo, cant in tipos_detectados.items()])
+                    tipos_str = " | ".join([f"{tipo}: {cant}" for tipo, cant
+                                            in zip(detector.clases, conteo_clases.tolist()) if cant > 0])
                     placa_str = f" | Autos→Placas: {autos_para_placas}" if autos_para_placas > 0 else ""
                     print(f"📍 Frame {frame_idx}: {tipos_str}{placa_str} ({avg_time:.1f}ms)")
                 
@@ -215,33 +318,27 @@ class DetectorAsincrono:
                 print(f"Error en detección de vehículos: {e}")
                 continue
     
-    def guardar_crop_async(self, frame, box, clase, frame_idx):
-        """Guardar crop de forma asíncrona"""
+    def guardar_crop_async(self, crop, clase, frame_idx):
+        """Guardar crop ya recortado (con margen) de forma asíncrona"""
         try:
-            x1, y1, x2, y2 = box
-            margin = 5
-            h, w = frame.shape[:2]
-            x1 = max(0, x1 - margin)
-            y1 = max(0, y1 - margin)
-            x2 = min(w, x2 + margin)
-            y2 = min(h, y2 + margin)
-            
-            crop = frame[y1:y2, x1:x2]
-            
-            if crop.size > 0 and crop.shape[0] > 30 and crop.shape[1] > 30:
+            if crop.size > 0:
                 filename = f"crops/{clase}_{frame_idx}_{int(time.time()*1000)}.jpg"
-                cv2.imwrite(filename, crop)
+                self.disco_crops.guardar(filename, crop)
         except Exception as e:
             print(f"Error guardando crop: {e}")
     
-    def procesar_video(self, video_path):
+    def procesar_video(self, video_path, mostrar=True):
         """Procesamiento principal con detección de vehículos y placas"""
+        self.inicio_sesion = time.time()
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             print("Error abriendo video")
             return False
         
         fps = cap.get(cv2.CAP_PROP_FPS)
+        if not fps > 0:  # Muchos streams RTSP reportan 0 (o NaN)
+            print(f"⚠️ El video no informa FPS, se asume {FPS_POR_DEFECTO}")
+            fps = FPS_POR_DEFECTO
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         
         print(f"Video: {total_frames} frames {fps:.1f} FPS")
@@ -259,12 +356,25 @@ class DetectorAsincrono:
             placa_thread.daemon = True
             placa_thread.start()
         
+        if self.controlador:
+            self.controlador.iniciar()
+        
+        vigilante = None
+        if self.modo_continuo:
+            vigilante = Vigilante(self.estado_recursos, self.limites['intervalo_vigilancia_s'],
+                                  vigilar_descartes={
+                                      'frames': ('ofrecidos_frames', 'descartados_frames'),
+                                      'placas': ('ofrecidos_placas', 'descartados_placas'),
+                                  })
+            vigilante.iniciar()
+        
         frame_idx = 0
         detection_frame_counter = 0
         
         # Control de FPS
         target_fps = min(fps, 30)
         frame_time = 1.0 / target_fps
+        self.frame_time_ms = frame_time * 1000
         last_frame_time = time.time()
         
         while True:
@@ -285,14 +395,17 @@ class DetectorAsincrono:
             
             # Procesar cada x frames
             detection_frame_counter += 1
-            if detection_frame_counter >= 5:
+            if detection_frame_counter >= self.intervalo_muestreo:
                 detection_frame_counter = 0
                 
+                self.ofrecidos['frames'] += 1
                 if not self.frame_queue.full():
                     try:
-                        self.frame_queue.put_nowait((frame.copy(), frame_idx))
+                        self.frame_queue.put_nowait((frame.copy(), frame_idx, time.time()))
                     except:
-                        pass
+                        self.descartados['frames'] += 1
+                else:
+                    self.descartados['frames'] += 1
             
             # Obtener detecciones y placas actuales
             with self.detection_lock:
@@ -331,6 +444,8 @@ class DetectorAsincrono:
                 if tiene_placa:
                     placa_conf = placas_actuales[auto_id]['placa_info']['conf']
                     conf_text += f" | Placa: {int(placa_conf*100)}%"
+                    if placas_actuales[auto_id].get('texto'):
+                        conf_text += f" {placas_actuales[auto_id]['texto']}"
                 
                 label_size = cv2.getTextSize(conf_text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
                 
@@ -347,37 +462,80 @@ class DetectorAsincrono:
             with self.detection_lock:
                 es_lento = frame_idx in self.frames_lentos
 
-            if not es_lento:
-                cv2.imshow("Deteccion de Vehiculos y Placas", frame_display)
-            else:
-                print(f"⚠️ Frame {frame_idx} omitido por detección lenta (>200ms)")
-            
-            # Control de teclado
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                break
+            if mostrar:
+                if not es_lento:
+                    cv2.imshow("Deteccion de Vehiculos y Placas", frame_display)
+                else:
+                    print(f"⚠️ Frame {frame_idx} omitido por detección lenta (>200ms)")
+                
+                # Control de teclado
+                key = cv2.waitKey(1) & 0xFF
+                if key == ord('q'):
+                    break
             
             frame_idx += 1
         
         # Cleanup
         self.running = False
         cap.release()
-        cv2.destroyAllWindows()
+        if mostrar:
+            cv2.destroyAllWindows()
         
         detection_thread.join(timeout=3)
         if placa_thread:
             placa_thread.join(timeout=3)
+        if vigilante:
+            vigilante.detener()
+        if self.controlador:
+            self.controlador.detener()
         
         print("\nProcesamiento completado")
         self.mostrar_estadisticas()
         
         return True
     
+    def estado_recursos(self):
+        """
+        Poda los mapas expirados y devuelve el tamaño de colas, mapas y carpetas.
+
+        Lo usa el vigilante del modo continuo en cada reporte.
+        """
+        with self.placas_lock:
+            self.placas_detectadas.podar()
+            placas = len(self.placas_detectadas)
+        with self.detection_lock:
+            frames_lentos = len(self.frames_lentos)
+        return {
+            'cola_frames': self.frame_queue.qsize(),
+            'cola_placas': self.placa_queue.qsize(),
+            'placas_detectadas': placas,
+            'frames_lentos': frames_lentos,
+            'crops_mb': round(self.disco_crops.bytes_usados / (1024 * 1024), 1),
+            'placas_mb': round(self.disco_placas.bytes_usados / (1024 * 1024), 1),
+            'ofrecidos_frames': self.ofrecidos['frames'],
+            'descartados_frames': self.descartados['frames'],
+            'ofrecidos_placas': self.ofrecidos['placas'],
+            'descartados_placas': self.descartados['placas'],
+        }
+    
+    def resumen(self):
+        """Estadísticas de la sesión actual como diccionario"""
+        return {
+            'frames_procesados': self.frames_procesados,
+            'vehiculos_detectados': self.vehiculos_detectados,
+            'placas_encontradas': self.placas_encontradas,
+            'descartados': dict(self.descartados),
+            'contadores_vehiculos': dict(self.contadores_vehiculos),
+            'metricas_arranque': dict(self.metricas_arranque),
+        }
+    
     def mostrar_estadisticas(self):
         """Mostrar estadísticas detalladas incluyendo placas"""
         
         print(f"\n📊 ESTADÍSTICAS DETALLADAS:")
         print(f"Frames procesados: {self.frames_procesados}")
+        if self.descartados['frames'] or self.descartados['placas']:
+            print(f" Descartados por cola llena: frames {self.descartados['frames']} | placas {self.descartados['placas']}")
         print(f" Total vehículos: {self.vehiculos_detectados}")
         
         if self.detector_placas:
@@ -390,9 +548,24 @@ class DetectorAsincrono:
                 porcentaje = (cantidad / self.vehiculos_detectados * 100) if self.vehiculos_detectados > 0 else 0
                 print(f"   {tipo.capitalize():>12}: {cantidad:>4} ({porcentaje:.1f}%)")
         
+        # Tiempos de arranque
+        print(f"\n⏱️ ARRANQUE:")
+        for metrica, valor in self.metricas_arranque.items():
+            if valor is not None:
+                print(f"   {metrica:>22}: {valor:.0f}ms")
+        if self.detector_vehiculos.tiempo_carga is not None:
+            print(f"   {'carga_vehiculos_ms':>22}: {self.detector_vehiculos.tiempo_carga:.0f}ms")
+        if self.detector_placas and self.detector_placas.tiempo_carga is not None:
+            print(f"   {'carga_placas_ms':>22}: {self.detector_placas.tiempo_carga:.0f}ms")
+        
         print(f"Crops guardados en: crops/")
         if self.detector_placas:
             print(f"Placas guardadas en: placas/")
+        if self.controlador:
+            cambios = sum(1 for r in self.controlador.historial if r['decision'] != 'mantener')
+            print(f"Controlador adaptativo: nivel final {self.controlador.nivel} ({cambios} cambios)")
+        if self.modo_continuo:
+            print(f"Archivos rotados por cuota: crops {self.disco_crops.rotados} | placas {self.disco_placas.rotados}")
 
 
 def reset_folder(folder_path):
@@ -402,9 +575,14 @@ def reset_folder(folder_path):
     os.makedirs(folder_path) 
     
 
-def procesar_video(video_path, modelo_vehiculos_path, modelo_placas_path=None):
+def procesar_video(video_path, modelo_vehiculos_path, modelo_placas_path=None,
+                   carga_diferida=False, calentar=False, mostrar=True, modo_continuo=False,
+                   ocr_en_vivo=False, adaptativo=False, lag_objetivo_ms=500, roi=None):
     """Función principal con detección de vehículos y placas"""
     print("Iniciando detección")
     
-    detector = DetectorAsincrono(modelo_vehiculos_path, modelo_placas_path)
-    return detector.procesar_video(video_path)
\ No newline at end of file
+    detector = DetectorAsincrono(modelo_vehiculos_path, modelo_placas_path,
+                                 carga_diferida=carga_diferida, calentar=calentar,
+                                 modo_continuo=modo_continuo, ocr_en_vivo=ocr_en_vivo,
+                                 adaptativo=adaptativo, lag_objetivo_ms=lag_objetivo_ms, roi=roi)
+    return detector.procesar_video(video_path, mostrar=mostrar)
\ No newline at end of file
@@ -0,0 +1,220 @@
+import os
+import threading
+import time
+from collections import deque
+
+try:
+    import psutil
+except ImportError:  # Sin psutil se lee /proc (solo Linux)
+    psutil = None
+
+
+class MapaAcotado:
+    def __init__(self, max_elementos=1000, ttl_s=None):
+        """
+        Diccionario con límite de elementos y expiración por tiempo.
+
+        Al superar max_elementos se descartan los más antiguos. Las entradas con más
+        de ttl_s segundos se eliminan al llamar a podar().
+        """
+        self.max_elementos = max_elementos
+        self.ttl_s = ttl_s
+        self._datos = {}  # clave -> (tiempo, valor), en orden de inserción
+        self.descartados = 0
+
+    def __setitem__(self, clave, valor):
+        self._datos.pop(clave, None)  # Reinsertar al final
+        self._datos[clave] = (time.time(), valor)
+        while len(self._datos) > self.max_elementos:
+            del self._datos[next(iter(self._datos))]
+            self.descartados += 1
+
+    def __getitem__(self, clave):
+        return self._datos[clave][1]
+
+    def __delitem__(self, clave):
+        del self._datos[clave]
+
+    def __contains__(self, clave):
+        return clave in self._datos
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __iter__(self):
+        return iter(self._datos)
+
+    def get(self, clave, defecto=None):
+        return self._datos[clave][1] if clave in self._datos else defecto
+
+    def pop(self, clave, *defecto):
+        if clave in self._datos:
+            return self._datos.pop(clave)[1]
+        if defecto:
+            return defecto[0]
+        raise KeyError(clave)
+
+    def keys(self):
+        return self._datos.keys()
+
+    def values(self):
+        return [valor for _, valor in self._datos.values()]
+
+    def items(self):
+        return [(clave, valor) for clave, (_, valor) in self._datos.items()]
+
+    def copy(self):
+        """Copia superficial que conserva límites y tiempos de inserción"""
+        copia = MapaAcotado(self.max_elementos, self.ttl_s)
+        copia._datos = dict(self._datos)
+        return copia
+
+    def agregar(self, clave):
+        """Uso como conjunto acotado"""
+        self[clave] = None
+
+    def podar(self):
+        """Elimina las entradas expiradas y devuelve cuántas se eliminaron"""
+        if self.ttl_s is None:
+            return 0
+        limite = time.time() - self.ttl_s
+        expiradas = [clave for clave, (tiempo, _) in self._datos.items() if tiempo < limite]
+        for clave in expiradas:
+            del self._datos[clave]
+        self.descartados += len(expiradas)
+        return len(expiradas)
+
+
+class DirectorioRotativo:
+    def __init__(self, carpeta, max_mb=None, max_archivos=None, escribir=None):
+        """
+        Guarda imágenes en una carpeta respetando una cuota de disco.
+
+        Cuando se supera max_mb o max_archivos se borran los archivos más antiguos.
+        Sin límites se comporta como un cv2.imwrite normal. `escribir(ruta, imagen)`
+        reemplaza a cv2.imwrite si se indica.
+        """
+        self.carpeta = carpeta
+        self.escribir = escribir
+        self.max_bytes = int(max_mb * 1024 * 1024) if max_mb else None
+        self.max_archivos = max_archivos
+        self.archivos = deque()  # (ruta, bytes) en orden de escritura
+        self.bytes_usados = 0
+        self.rotados = 0
+        self.lock = threading.Lock()
+
+    @property
+    def con_limite(self):
+        return self.max_bytes is not None or self.max_archivos is not None
+
+    def guardar(self, ruta, imagen):
+        """Escribe la imagen y rota los archivos antiguos si hace falta"""
+        if self.escribir is None:
+            import cv2
+            self.escribir = cv2.imwrite
+        if not self.escribir(ruta, imagen):
+            return False
+        if not self.con_limite:
+            return True
+
+        tamano = os.path.getsize(ruta)
+        with self.lock:
+            self.archivos.append((ruta, tamano))
+            self.bytes_usados += tamano
+            while self.archivos and (
+                    (self.max_bytes is not None and self.bytes_usados > self.max_bytes) or
+                    (self.max_archivos is not None and len(self.archivos) > self.max_archivos)):
+                antigua, tamano_antigua = self.archivos.popleft()
+                self.bytes_usados -= tamano_antigua
+                try:
+                    os.remove(antigua)
+                except OSError:
+                    pass
+                self.rotados += 1
+        return True
+
+
+def memoria_rss_mb():
+    """Memoria residente del proceso en MB"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open('/proc/self/statm') as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return 0.0
+
+
+class Vigilante:
+    def __init__(self, fuentes, intervalo_s=60, crecimiento_alerta=0.2, vigilar_descartes=None, tasa_descartes_alerta=0.05):
+        """
+        Hilo que reporta memoria y tamaño de colas y mapas cada cierto tiempo.
+
+        Args:
+            fuentes (callable): Devuelve un dict nombre -> valor actual (colas, mapas, disco, contadores).
+            intervalo_s (float, optional): Segundos entre reportes. Default es 60.
+            crecimiento_alerta (float, optional): Aumento relativo de RSS sobre la base que genera alerta. Default es 0.2.
+            vigilar_descartes (dict, optional): nombre -> (fuente de ofrecidos, fuente de descartados), ambos contadores acumulados.
+            tasa_descartes_alerta (float, optional): Fracción descartada entre dos reportes que genera alerta. Default es 0.05.
+        """
+        self.fuentes = fuentes
+        self.intervalo_s = intervalo_s
+        self.crecimiento_alerta = crecimiento_alerta
+        self.vigilar_descartes = dict(vigilar_descartes or {})
+        self.tasa_descartes_alerta = tasa_descartes_alerta
+        self.rss_base = None
+        self.historial = deque(maxlen=1440)  # Un día de reportes por minuto
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(timeout=3)
+
+    def reportar(self):
+        """Toma una muestra, la imprime y la guarda en el historial"""
+        rss = memoria_rss_mb()
+        if self.rss_base is None:
+            self.rss_base = rss
+        muestra = {'tiempo': time.time(), 'rss_mb': rss}
+        muestra.update(self.fuentes())
+        self.historial.append(muestra)
+
+        detalle = " | ".join(f"{nombre}: {valor}" for nombre, valor in muestra.items()
+                             if nombre not in ('tiempo', 'rss_mb'))
+        print(f"🩺 RSS: {rss:.0f}MB | {detalle}")
+
+        if self.rss_base and rss > self.rss_base * (1 + self.crecimiento_alerta):
+            print(f"⚠️ La memoria creció {(rss / self.rss_base - 1) * 100:.0f}% desde el inicio ({self.rss_base:.0f}MB)")
+
+        for nombre, tasa in self.tasas_descartes().items():
+            if tasa > self.tasa_descartes_alerta:
+                print(f"⚠️ Se descartó el {tasa:.0%} de {nombre} desde el último reporte (cola llena)")
+        return muestra
+
+    def tasas_descartes(self):
+        """Fracción descartada entre las dos últimas muestras para cada cola vigilada"""
+        tasas = {}
+        if len(self.historial) < 2:
+            return tasas
+        anterior, actual = self.historial[-2], self.historial[-1]
+        for nombre, (clave_ofrecidos, clave_descartados) in self.vigilar_descartes.items():
+            ofrecidos = actual.get(clave_ofrecidos, 0) - anterior.get(clave_ofrecidos, 0)
+            descartados = actual.get(clave_descartados, 0) - anterior.get(clave_descartados, 0)
+            if ofrecidos > 0 and descartados >= 0:  # Contadores reiniciados: se ignora la muestra
+                tasas[nombre] = descartados / ofrecidos
+        return tasas
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo_s):
+            try:
+                self.reportar()
+            except Exception as e:
+                print(f"Error en vigilante: {e}")
@@ -0,0 +1,293 @@
+import argparse
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from aiohttp import web
+
+from .detector_placas import DetectorPlacas
+from .detector_vehiculos import DetectorVehiculos, expandir_cajas
+
+
+class MicroLotes:
+    def __init__(self, procesar_lote, max_lote=8, max_espera_ms=10, max_pendientes=256, timeout_s=30):
+        """
+        Agrupa peticiones concurrentes en lotes para llamar a los modelos una sola vez.
+
+        Args:
+            procesar_lote (callable): Función síncrona que recibe una lista de items y devuelve una lista de resultados.
+            max_lote (int, optional): Tamaño máximo de un lote. Default es 8.
+            max_espera_ms (float, optional): Tiempo máximo que espera el primer item a que llegue compañía. Default es 10.
+            max_pendientes (int, optional): Tamaño de la cola; si se llena las peticiones se rechazan. Default es 256.
+            timeout_s (float, optional): Tiempo máximo que una petición espera su resultado. Default es 30.
+        """
+        self.procesar_lote = procesar_lote
+        self.max_lote = max_lote
+        self.max_espera = max_espera_ms / 1000
+        self.timeout_s = timeout_s
+        self.max_pendientes = max_pendientes
+        self.cola = None  # Se crea en iniciar(), dentro del loop que la usa
+        self.executor = ThreadPoolExecutor(max_workers=1)  # Un solo hilo usa los modelos
+        self.tamanos_lote = deque(maxlen=100)
+        self.tiempos_lote = deque(maxlen=100)
+        self._tarea = None
+
+    def iniciar(self):
+        self.cola = asyncio.Queue(maxsize=self.max_pendientes)
+        self._tarea = asyncio.create_task(self._bucle())
+
+    async def detener(self):
+        if self._tarea:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=False)
+
+    async def enviar(self, item):
+        """
+        Encola un item y espera su resultado.
+
+        Lanza asyncio.QueueFull si la cola está llena y asyncio.TimeoutError si no hay
+        resultado en timeout_s segundos.
+        """
+        if self.cola is None:
+            raise RuntimeError("MicroLotes no iniciado: llamar a iniciar() dentro del loop")
+        futuro = asyncio.get_running_loop().create_future()
+        self.cola.put_nowait((item, futuro))
+        return await asyncio.wait_for(futuro, self.timeout_s)
+
+    async def _bucle(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Esperar el primer item y juntar los que lleguen dentro de la ventana
+            lote = [await self.cola.get()]
+            limite = loop.time() + self.max_espera
+            # get_nowait + sleep: wait_for(cola.get()) puede perder un item en Python < 3.12
+            while len(lote) < self.max_lote:
+                try:
+                    lote.append(self.cola.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                await asyncio.sleep(min(restante, 0.001))
+
+            # Las peticiones vencidas o canceladas mientras esperaban no se procesan
+            lote = [(item, futuro) for item, futuro in lote if not futuro.done()]
+            if not lote:
+                continue
+
+            start_time = time.time()
+            try:
+                resultados = await loop.run_in_executor(
+                    self.executor, self.procesar_lote, [item for item, _ in lote])
+            except Exception as e:
+                print(f"Error procesando lote: {e}")
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+
+            self.tamanos_lote.append(len(lote))
+            self.tiempos_lote.append((time.time() - start_time) * 1000)
+
+            for (_, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():  # El cliente pudo haberse desconectado
+                    futuro.set_result(resultado)
+
+
+class ServidorInferencia:
+    def __init__(self, modelo_vehiculos_path, modelo_placas_path=None, ocr=True,
+                 max_lote=8, max_espera_ms=10, calentar=True, device=None):
+        """
+        Servicio HTTP local que recibe imágenes y devuelve vehículos, placas y texto OCR.
+
+        Args:
+            modelo_vehiculos_path (str): Ruta al modelo para detección de vehículos.
+            modelo_placas_path (str, optional): Ruta al modelo para detección de placas. Default es None.
+            ocr (bool, optional): Si es True lee el texto de las placas con PaddleOCR. Default es True.
+            max_lote (int, optional): Máximo de imágenes por llamada al modelo. Default es 8.
+            max_espera_ms (float, optional): Ventana para juntar peticiones en un lote. Default es 10.
+            calentar (bool, optional): Si es True hace una inferencia de prueba al iniciar. Default es True.
+            device (str, optional): 'cuda' o 'cpu'. Default es None (se elige según torch al cargar los modelos).
+        """
+        start_time = time.time()
+
+        self.detector_vehiculos = DetectorVehiculos(modelo_vehiculos_path, device)
+        self.detector_placas = DetectorPlacas(modelo_placas_path, device) if modelo_placas_path else None
+        print(f"🖥️ Usando dispositivo: {self.device.upper()}")
+
+        self.lector = None
+        if ocr and self.detector_placas:
+            from .lector_placas import LectorPlacasPaddle
+            self.lector = LectorPlacasPaddle()
+
+        if calentar:
+            self.detector_vehiculos.calentar()
+            if self.detector_placas:
+                self.detector_placas.calentar()
+            if self.lector:
+                self.lector.calentar()
+
+        self.min_auto_size = 100  # Tamaño mínimo para intentar detectar placa
+        self.lotes = MicroLotes(self.procesar_lote, max_lote, max_espera_ms)
+
+        # Estadísticas
+        self.peticiones = 0
+        self.rechazadas = 0
+        self.tiempos_peticion = deque(maxlen=1000)
+
+        self.tiempo_arranque = (time.time() - start_time) * 1000
+        print(f"⏱️ Servidor listo en {self.tiempo_arranque:.0f}ms")
+
+    @property
+    def device(self):
+        return self.detector_vehiculos.device
+
+    def procesar_lote(self, items):
+        """
+        Procesa un lote de (frame, con_ocr) con una llamada por modelo.
+
+        Returns:
+            list: Por cada frame, la lista de vehículos con su placa (o None).
+        """
+        frames = [frame for frame, _ in items]
+        detector = self.detector_vehiculos
+        arrays_por_frame = detector.detectar_arrays_lote(frames)
+        idx_car = detector.clases.index('car')
+
+        # Juntar los autos de todo el lote para el detector de placas
+        respuesta = []
+        candidatos = []  # (vehiculo_respuesta, crop_auto, origen, con_ocr)
+        for (frame, con_ocr), arrays in zip(items, arrays_por_frame):
+            boxes, clases = arrays['boxes'], arrays['clases']
+            salida = [{'box': box, 'clase': detector.clases[clase], 'conf': conf, 'placa': None}
+                      for box, clase, conf in zip(boxes.tolist(), clases.tolist(), arrays['conf'].tolist())]
+            respuesta.append(salida)
+
+            if not self.detector_placas:
+                continue
+
+            # Autos suficientemente grandes, con crop expandido para mejor detección de placa
+            h, w = frame.shape[:2]
+            elegibles = np.flatnonzero((clases == idx_car) &
+                                       ((boxes[:, 2] - boxes[:, 0]) >= self.min_auto_size) &
+                                       ((boxes[:, 3] - boxes[:, 1]) >= self.min_auto_size))
+            cajas = expandir_cajas(boxes[elegibles], 10, w, h)
+            for i, (x1, y1, x2, y2) in zip(elegibles.tolist(), cajas.tolist()):
+                crop_auto = frame[y1:y2, x1:x2]
+                if crop_auto.size > 0:
+                    candidatos.append((salida[i], crop_auto, (x1, y1), con_ocr))
+
+        if not candidatos:
+            return respuesta
+
+        placas = self.detector_placas.detectar_placas_lote([crop for _, crop, _, _ in candidatos])
+
+        for (vehiculo_respuesta, _, (ox, oy), con_ocr), placa in zip(candidatos, placas):
+            if placa is None:
+                continue
+            px1, py1, px2, py2 = placa['box']
+            texto = None
+            if con_ocr and self.lector:
+                texto = self.lector.leer_placa_con_paddle(self.lector.preprocesar_imagen(placa['crop']))
+            vehiculo_respuesta['placa'] = {
+                'box': [px1 + ox, py1 + oy, px2 + ox, py2 + oy],  # Coordenadas en el frame
+                'conf': placa['conf'],
+                'texto': texto
+            }
+
+        return respuesta
+
+    async def detectar(self, request):
+        """POST /detectar: cuerpo con la imagen codificada (jpg/png). ?ocr=0 desactiva el OCR"""
+        start_time = time.time()
+        datos = await request.read()
+        if not datos:
+            return web.json_response({'error': 'Cuerpo vacío: se esperaba una imagen'}, status=400)
+
+        loop = asyncio.get_running_loop()
+        try:
+            frame = await loop.run_in_executor(
+                None, cv2.imdecode, np.frombuffer(datos, np.uint8), cv2.IMREAD_COLOR)
+        except cv2.error:
+            frame = None
+        if frame is None:
+            return web.json_response({'error': 'Imagen inválida'}, status=400)
+
+        con_ocr = request.query.get('ocr', '1') != '0'
+        try:
+            vehiculos = await self.lotes.enviar((frame, con_ocr))
+        except asyncio.QueueFull:
+            self.rechazadas += 1
+            return web.json_response({'error': 'Servidor saturado'}, status=503)
+        except asyncio.TimeoutError:
+            return web.json_response({'error': 'Tiempo de espera agotado'}, status=504)
+        except Exception as e:
+            print(f"Error procesando petición: {e}")
+            return web.json_response({'error': f"Error en la inferencia: {e}"}, status=500)
+
+        tiempo_ms = (time.time() - start_time) * 1000
+        self.peticiones += 1
+        self.tiempos_peticion.append(tiempo_ms)
+        return web.json_response({'vehiculos': vehiculos, 'tiempo_ms': tiempo_ms})
+
+    async def estado(self, request):
+        """GET /estado: métricas del servidor"""
+        lotes = self.lotes
+        return web.json_response({
+            'arranque_ms': self.tiempo_arranque,
+            'peticiones': self.peticiones,
+            'rechazadas': self.rechazadas,
+            'pendientes': lotes.cola.qsize() if lotes.cola else 0,
+            'lote_promedio': sum(lotes.tamanos_lote) / len(lotes.tamanos_lote) if lotes.tamanos_lote else 0,
+            'tiempo_lote_promedio_ms': sum(lotes.tiempos_lote) / len(lotes.tiempos_lote) if lotes.tiempos_lote else 0,
+            'tiempo_peticion_promedio_ms': sum(self.tiempos_peticion) / len(self.tiempos_peticion) if self.tiempos_peticion else 0,
+        })
+
+    def crear_app(self):
+        app = web.Application(client_max_size=20 * 1024 * 1024)
+        app.router.add_post('/detectar', self.detectar)
+        app.router.add_get('/estado', self.estado)
+
+        async def al_iniciar(app):
+            self.lotes.iniciar()
+
+        async def al_cerrar(app):
+            await self.lotes.detener()
+
+        app.on_startup.append(al_iniciar)
+        app.on_cleanup.append(al_cerrar)
+        return app
+
+
+def iniciar_servidor(modelo_vehiculos_path, modelo_placas_path=None, ocr=True,
+                     host='127.0.0.1', puerto=8080, max_lote=8, max_espera_ms=10):
+    """Función simple para levantar el servidor HTTP y bloquear hasta que se detenga"""
+    servidor = ServidorInferencia(modelo_vehiculos_path, modelo_placas_path, ocr=ocr,
+                                  max_lote=max_lote, max_espera_ms=max_espera_ms)
+    print(f"🛰️ Servidor de inferencia en http://{host}:{puerto}")
+    web.run_app(servidor.crear_app(), host=host, port=puerto)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local de inferencia de vehículos y placas")
+    parser.add_argument("--modelo-vehiculos", default='yolo11n.pt')
+    parser.add_argument("--modelo-placas", default="models/best.pt")
+    parser.add_argument("--sin-ocr", action="store_true")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--max-lote", type=int, default=8)
+    parser.add_argument("--max-espera-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    iniciar_servidor(args.modelo_vehiculos, args.modelo_placas, ocr=not args.sin_ocr,
+                     host=args.host, puerto=args.puerto,
+                     max_lote=args.max_lote, max_espera_ms=args.max_espera_ms)
@@ -1,13 +1,90 @@
-from detector import procesar_video
-from detector.lector_placas import leer_placas_paddle
+import argparse
+import os
+import sys
+
+VIDEO_PATH = "data/video.mp4"
+MODELO_VEHICULOS_PATH = 'yolo11n.pt'
+# MODELO_VEHICULOS_PATH = 'yolov8n.pt'
+MODELO_PLACAS_PATH = "models/best.pt"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Detección de vehículos y lectura de placas")
+    parser.add_argument("--video", default=VIDEO_PATH)
+    parser.add_argument("--diferido", action="store_true",
+                        help="Cargar los modelos en su primer uso")
+    parser.add_argument("--calentar", action="store_true",
+                        help="Hacer una inferencia de prueba antes del primer frame")
+    parser.add_argument("--continuo", action="store_true",
+                        help="Modo 24/7: estado acotado, cuotas de disco y vigilante de memoria")
+    parser.add_argument("--ocr-en-vivo", action="store_true",
+                        help="Leer el texto de cada placa mientras se procesa el video")
+    parser.add_argument("--adaptativo", action="store_true",
+                        help="Ajustar muestreo, resolución, umbral de placas y OCR según la carga")
+    parser.add_argument("--lag-objetivo-ms", type=float, default=500,
+                        help="Atraso máximo que intenta mantener el modo adaptativo")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Mantener los modelos cargados y atender tareas")
+    parser.add_argument("--usar-daemon", action="store_true",
+                        help="Enviar el trabajo a un servicio ya iniciado con --daemon")
+    parser.add_argument("--servidor", action="store_true",
+                        help="Levantar el servidor HTTP de inferencia en 127.0.0.1:8080")
+    args = parser.parse_args()
+
+    # El servicio ya tiene su DetectorAsincrono armado; estas opciones no viajan con la tarea
+    if args.usar_daemon:
+        ignoradas = [opcion for opcion, activa in (('--continuo', args.continuo),
+                                                    ('--adaptativo', args.adaptativo),
+                                                    ('--ocr-en-vivo', args.ocr_en_vivo)) if activa]
+        if ignoradas:
+            parser.error(f"--usar-daemon no admite {', '.join(ignoradas)}")
+    return args
+
 
 if __name__ == "__main__":
-    procesar_video(
-        video_path="data/video.mp4",
-        modelo_vehiculos_path='yolo11n.pt',
-        # modelo_vehiculos_path='yolov8n.pt',
-        modelo_placas_path="models/best.pt"
-    )
-    
-    print("\nLeyendo placas con PaddleOCR...")
-    leer_placas_paddle("placas/", debug=True)
+    args = parse_args()
+
+    if args.daemon:
+        from detector.daemon import iniciar_servicio
+        iniciar_servicio(MODELO_VEHICULOS_PATH, MODELO_PLACAS_PATH, ocr=True)
+
+    elif args.servidor:
+        from detector.servidor import iniciar_servidor
+        iniciar_servidor(MODELO_VEHICULOS_PATH, MODELO_PLACAS_PATH)
+
+    elif args.usar_daemon:
+        from detector import enviar_tarea
+        # Rutas absolutas: el servicio corre en su propio directorio de trabajo (las URL de streams no se tocan)
+        video_path = args.video if '://' in args.video else os.path.abspath(args.video)
+        respuesta = enviar_tarea({'tipo': 'video', 'video_path': video_path})
+        if not respuesta.get('ok'):
+            print(f"❌ El servicio no pudo procesar el video: {respuesta.get('error', 'sin detalle')}")
+            sys.exit(1)
+        print(f"Video procesado en {respuesta.get('tiempo_tarea_ms', 0):.0f}ms: {respuesta.get('estadisticas')}")
+
+        print("\nLeyendo placas con PaddleOCR...")
+        carpeta_placas = respuesta.get('carpeta_placas', os.path.abspath("placas/"))
+        respuesta = enviar_tarea({'tipo': 'ocr', 'carpeta_placas': carpeta_placas, 'debug': True})
+        if not respuesta.get('ok'):
+            print(f"❌ El servicio no pudo leer las placas: {respuesta.get('error', 'sin detalle')}")
+            sys.exit(1)
+        print(f"OCR completado en {respuesta.get('tiempo_tarea_ms', 0):.0f}ms")
+
+    else:
+        from detector import procesar_video
+        from detector.lector_placas import leer_placas_paddle
+
+        procesar_video(
+            video_path=args.video,
+            modelo_vehiculos_path=MODELO_VEHICULOS_PATH,
+            modelo_placas_path=MODELO_PLACAS_PATH,
+            carga_diferida=args.diferido,
+            calentar=args.calentar,
+            modo_continuo=args.continuo,
+            ocr_en_vivo=args.ocr_en_vivo,
+            adaptativo=args.adaptativo,
+            lag_objetivo_ms=args.lag_objetivo_ms
+        )
+
+        print("\nLeyendo placas con PaddleOCR...")
+        leer_placas_paddle("placas/", debug=True)
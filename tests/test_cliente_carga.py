@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from detector.cliente_carga import percentil
+
+
+def test_percentil_rango_mas_cercano():
+    valores = list(range(1, 101))
+
+    assert percentil(valores, 50) == 50
+    assert percentil(valores, 95) == 95
+    assert percentil(valores, 99) == 99
+    assert percentil(valores, 100) == 100
+
+
+def test_percentil_casos_borde():
+    assert percentil([], 95) == 0.0
+    assert percentil([7.5], 99) == 7.5
+    assert percentil([3, 1, 2], 0) == 1
+
+
+def test_percentil_con_rango_fraccionario():
+    # p * N / 100 no es entero: el rango más cercano redondea hacia arriba
+    assert percentil([1, 2, 3, 4, 5], 50) == 3
+    assert percentil(list(range(1, 31)), 95) == 29
+    assert percentil(list(range(1, 31)), 99) == 30
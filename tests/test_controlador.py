@@ -0,0 +1,100 @@
+import time
+from collections import deque
+from queue import Queue
+from types import SimpleNamespace
+
+from detector.controlador import ControladorAdaptativo
+
+
+def crear_detector(con_placas=True, ocr=True):
+    return SimpleNamespace(
+        intervalo_muestreo=5,
+        detector_vehiculos=SimpleNamespace(imgsz=640),
+        detector_placas=SimpleNamespace(conf_threshold=0.35) if con_placas else None,
+        ocr_activo=ocr,
+        lags=deque(),
+        tiempos_procesamiento=deque([50.0]),
+        tiempos_placas=deque([20.0]),
+        tiempos_ocr=deque(),
+        frame_time_ms=33.3,
+        frame_queue=Queue(maxsize=5),
+        placa_queue=Queue(maxsize=10),
+    )
+
+
+def simular(controlador, detector, lag_ms, evaluaciones):
+    for _ in range(evaluaciones):
+        detector.lags.append((time.time(), lag_ms))
+        controlador.evaluar()
+
+
+def test_pasos_sin_efecto_se_descartan():
+    detector = crear_detector(con_placas=False, ocr=False)
+    controlador = ControladorAdaptativo(detector)
+
+    assert controlador.pasos == [
+        {'intervalo_muestreo': 8},
+        {'imgsz': 480},
+        {'intervalo_muestreo': 12},
+        {'imgsz': 320},
+    ]
+
+
+def test_umbral_de_placas_es_el_ultimo_recurso():
+    controlador = ControladorAdaptativo(crear_detector())
+
+    perillas = [next(iter(paso)) for paso in controlador.pasos]
+
+    assert perillas[-2:] == ['conf_placas', 'conf_placas']
+    assert 'conf_placas' not in perillas[:-2]
+
+
+def test_perillas_nivel_nunca_mejoran_la_calidad():
+    detector = crear_detector()
+    detector.intervalo_muestreo = 10
+    controlador = ControladorAdaptativo(detector, pasos=[{'intervalo_muestreo': 8}, {'imgsz': 800}])
+
+    assert controlador.pasos == []
+    assert controlador.perillas_nivel(0) == controlador.base
+
+
+def test_degrada_bajo_carga_y_recupera_con_holgura():
+    detector = crear_detector()
+    controlador = ControladorAdaptativo(detector, lag_objetivo_ms=500, espera_s=0, ciclos_estables=2)
+
+    simular(controlador, detector, lag_ms=900, evaluaciones=2)
+    assert controlador.nivel == 2
+    assert detector.ocr_activo is False
+    assert detector.intervalo_muestreo == 8
+
+    simular(controlador, detector, lag_ms=900, evaluaciones=20)
+    assert controlador.nivel == len(controlador.pasos)
+    assert detector.detector_vehiculos.imgsz == 320
+    assert detector.detector_placas.conf_threshold == 0.65
+
+    detector.lags.clear()
+    detector.tiempos_procesamiento = deque([10.0])
+    for _ in range(2 * len(controlador.pasos)):
+        controlador.evaluar()
+    assert controlador.nivel == 0
+    assert controlador.leer_perillas() == controlador.base
+
+
+def test_espera_entre_cambios():
+    detector = crear_detector()
+    controlador = ControladorAdaptativo(detector, lag_objetivo_ms=500, espera_s=60)
+
+    simular(controlador, detector, lag_ms=900, evaluaciones=3)
+
+    assert controlador.nivel == 1
+    assert [r['decision'] for r in controlador.historial] == ['degradar', 'mantener', 'mantener']
+
+
+def test_cola_llena_degrada_sin_atraso():
+    detector = crear_detector()
+    for i in range(5):
+        detector.frame_queue.put(i)
+    controlador = ControladorAdaptativo(detector, espera_s=0)
+
+    assert controlador.evaluar() == 'degradar'
+    assert 'ocr_ms' in controlador.historial[-1]
@@ -0,0 +1,92 @@
+import os
+import stat
+import subprocess
+import sys
+
+import pytest
+
+from detector import daemon
+from detector.daemon import ServicioDetector, obtener_clave
+
+
+@pytest.fixture
+def archivo_clave(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "config" / "daemon.key")
+    monkeypatch.setattr(daemon, 'ARCHIVO_CLAVE', ruta)
+    monkeypatch.delenv(daemon.VARIABLE_CLAVE, raising=False)
+    return ruta
+
+
+def crear_servicio():
+    # Sin __init__ para no cargar modelos: atender solo usa estos atributos al rechazar
+    servicio = ServicioDetector.__new__(ServicioDetector)
+    servicio.activo = True
+    servicio.tareas_atendidas = 0
+    return servicio
+
+
+def test_clave_se_crea_solo_legible_por_el_dueno(archivo_clave):
+    clave = obtener_clave(crear=True)
+
+    assert len(clave) == 32
+    assert stat.S_IMODE(os.stat(archivo_clave).st_mode) == 0o600
+    assert obtener_clave() == clave  # Los clientes leen la misma clave
+
+
+def test_clave_sin_archivo_falla(archivo_clave):
+    with pytest.raises(RuntimeError):
+        obtener_clave()
+
+
+def test_clave_legible_por_otros_se_rechaza(archivo_clave):
+    os.makedirs(os.path.dirname(archivo_clave))
+    with open(archivo_clave, "wb") as f:
+        f.write(b"secreta")
+    os.chmod(archivo_clave, 0o644)
+
+    with pytest.raises(RuntimeError):
+        obtener_clave()
+    with pytest.raises(RuntimeError):
+        obtener_clave(crear=True)  # Tampoco se reemplaza en silencio
+
+
+def test_variable_de_entorno_tiene_prioridad(archivo_clave, monkeypatch):
+    monkeypatch.setenv(daemon.VARIABLE_CLAVE, "desde-entorno")
+
+    assert obtener_clave(crear=True) == b"desde-entorno"
+    assert not os.path.exists(archivo_clave)
+
+
+def test_atender_rechaza_tareas_desconocidas():
+    servicio = crear_servicio()
+
+    respuesta = servicio.atender({'tipo': 'borrar_todo'})
+
+    assert respuesta['ok'] is False
+    assert 'borrar_todo' in respuesta['error']
+    assert servicio.tareas_atendidas == 0
+    assert servicio.activo
+
+
+@pytest.mark.parametrize("tarea", [None, "video", ["video"], 42])
+def test_atender_rechaza_tareas_que_no_son_objetos(tarea):
+    servicio = crear_servicio()
+
+    respuesta = servicio.atender(tarea)
+
+    assert respuesta['ok'] is False
+    assert servicio.tareas_atendidas == 0
+
+
+def test_import_detector_no_carga_dependencias_pesadas():
+    codigo = (
+        "import sys, detector\n"
+        "from detector import enviar_tarea\n"
+        "pesados = [m for m in ('torch', 'cv2', 'ultralytics', 'paddleocr') if m in sys.modules]\n"
+        "print(','.join(pesados))\n"
+    )
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=raiz,
+                            capture_output=True, text=True, check=True)
+
+    assert salida.stdout.strip() == ""
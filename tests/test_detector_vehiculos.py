@@ -0,0 +1,124 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from detector.detector_vehiculos import DetectorVehiculos, expandir_cajas
+
+
+def test_expandir_cajas_agrega_margen():
+    cajas = np.array([[100, 100, 200, 150]])
+
+    assert expandir_cajas(cajas, 10, 640, 480).tolist() == [[90, 90, 210, 160]]
+
+
+def test_expandir_cajas_recorta_a_los_bordes():
+    cajas = np.array([[3, 2, 635, 478], [0, 0, 640, 480]])
+
+    assert expandir_cajas(cajas, 10, 640, 480).tolist() == [[0, 0, 640, 480], [0, 0, 640, 480]]
+
+
+def test_expandir_cajas_vacio():
+    cajas = np.empty((0, 4), dtype=np.int64)
+
+    assert expandir_cajas(cajas, 5, 640, 480).shape == (0, 4)
+
+
+class Tensor:
+    """Imita un tensor de torch: solo .cpu().numpy()"""
+
+    def __init__(self, valores, dtype):
+        self.valores = np.array(valores, dtype=dtype)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.valores
+
+
+class Cajas:
+    def __init__(self, cajas):
+        self.xyxy = Tensor([c[:4] for c in cajas] or np.empty((0, 4)), np.float32)
+        self.cls = Tensor([c[4] for c in cajas], np.float32)
+        self.conf = Tensor([c[5] for c in cajas], np.float32)
+
+    def __len__(self):
+        return len(self.cls.valores)
+
+
+class Resultado:
+    """Imita results[0] de ultralytics: boxes.xyxy/cls/conf y names"""
+
+    def __init__(self, cajas):
+        self.boxes = Cajas(cajas)
+        self.names = {0: 'person', 2: 'car', 5: 'bus', 7: 'truck'}
+
+
+def detectar_por_caja(detector, results, frame_idx):
+    """Recorrido caja por caja previo a la versión vectorizada, como referencia"""
+    vehiculos = []
+    for i, (box, cls_id, conf) in enumerate(zip(results.boxes.xyxy.cpu().numpy(),
+                                               results.boxes.cls.cpu().numpy(),
+                                               results.boxes.conf.cpu().numpy())):
+        clase = results.names[int(cls_id)]
+        if clase not in detector.colores:
+            continue
+        x1, y1, x2, y2 = map(int, box)
+        if (x2 - x1) < detector.min_box_size or (y2 - y1) < detector.min_box_size:
+            continue
+        if detector.roi is not None:
+            rx1, ry1, rx2, ry2 = detector.roi
+            cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+            if not (rx1 <= cx < rx2 and ry1 <= cy < ry2):
+                continue
+        vehiculos.append({
+            'box': (x1, y1, x2, y2),
+            'clase': clase,
+            'conf': float(conf),
+            'frame_idx': frame_idx,
+            'auto_id': f"{frame_idx}_{i}_{clase}",
+        })
+    return vehiculos
+
+
+CAJAS = [
+    # x1, y1, x2, y2, cls, conf
+    (10.7, 20.2, 160.9, 180.5, 2, 0.91),   # auto
+    (0, 0, 300, 300, 0, 0.88),             # persona: fuera de las clases de interés
+    (50, 50, 120, 400, 7, 0.55),           # camión angosto: no pasa el filtro de tamaño
+    (400, 100, 620, 350, 5, 0.77),         # bus
+    (300, 300, 450, 470, 2, 0.42),         # auto
+]
+
+
+def test_extraer_arrays_coincide_con_el_recorrido_por_caja():
+    detector = DetectorVehiculos('modelo.pt', carga_diferida=True)
+    results = Resultado(CAJAS)
+
+    arrays = detector._extraer_arrays(results)
+
+    assert arrays['indices'].tolist() == [0, 3, 4]
+    assert [detector.clases[c] for c in arrays['clases'].tolist()] == ['car', 'bus', 'car']
+    assert detector.a_diccionarios(arrays, 7) == detectar_por_caja(detector, results, 7)
+    # auto_id conserva la posición original aunque haya cajas filtradas antes
+    assert [v['auto_id'] for v in detector.a_diccionarios(arrays, 7)] == ['7_0_car', '7_3_bus', '7_4_car']
+
+
+def test_extraer_arrays_filtra_por_centro_en_el_roi():
+    detector = DetectorVehiculos('modelo.pt', carga_diferida=True, roi=(0, 0, 400, 400))
+    results = Resultado(CAJAS)
+
+    vehiculos = detector.a_diccionarios(detector._extraer_arrays(results), 3)
+
+    # El bus (centro en 510, 225) queda fuera; el último auto (centro 375, 385) queda dentro
+    assert [v['auto_id'] for v in vehiculos] == ['3_0_car', '3_4_car']
+    assert vehiculos == detectar_por_caja(detector, results, 3)
+
+
+def test_extraer_arrays_sin_cajas():
+    detector = DetectorVehiculos('modelo.pt', carga_diferida=True)
+
+    arrays = detector._extraer_arrays(Resultado([]))
+
+    assert arrays['boxes'].shape == (0, 4)
+    assert detector.a_diccionarios(arrays, 0) == []
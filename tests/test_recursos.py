@@ -0,0 +1,105 @@
+import os
+
+from detector import recursos
+from detector.recursos import DirectorioRotativo, MapaAcotado, Vigilante
+
+
+def escribir_bytes(ruta, imagen):
+    with open(ruta, "wb") as f:
+        f.write(imagen)
+    return True
+
+
+def test_mapa_descarta_los_mas_antiguos():
+    mapa = MapaAcotado(max_elementos=3)
+    for i in range(5):
+        mapa[i] = i * 10
+
+    assert list(mapa) == [2, 3, 4]
+    assert mapa[4] == 40
+    assert mapa.descartados == 2
+
+
+def test_mapa_reinsertar_mueve_al_final():
+    mapa = MapaAcotado(max_elementos=2)
+    mapa['a'] = 1
+    mapa['b'] = 2
+    mapa['a'] = 3
+    mapa['c'] = 4
+
+    assert list(mapa) == ['a', 'c']
+    assert mapa['a'] == 3
+
+
+def test_mapa_podar_por_ttl(monkeypatch):
+    ahora = [1000.0]
+    monkeypatch.setattr(recursos.time, 'time', lambda: ahora[0])
+    mapa = MapaAcotado(max_elementos=10, ttl_s=5)
+    mapa['vieja'] = 1
+    ahora[0] += 4
+    mapa['nueva'] = 2
+    ahora[0] += 2
+
+    assert mapa.podar() == 1
+    assert list(mapa) == ['nueva']
+
+
+def test_mapa_pop_y_copy():
+    mapa = MapaAcotado(max_elementos=2, ttl_s=30)
+    mapa.agregar('x')
+    mapa['y'] = 1
+
+    assert mapa.pop('y') == 1
+    assert mapa.pop('y', None) is None
+    assert 'y' not in mapa and len(mapa) == 1
+
+    copia = mapa.copy()
+    assert (copia.max_elementos, copia.ttl_s) == (2, 30)
+    copia['z'] = 2
+    copia['w'] = 3
+    assert list(copia) == ['z', 'w']
+    assert list(mapa) == ['x']
+
+
+def test_directorio_rota_por_cantidad(tmp_path):
+    disco = DirectorioRotativo(str(tmp_path), max_archivos=2, escribir=escribir_bytes)
+    for i in range(4):
+        disco.guardar(str(tmp_path / f"{i}.jpg"), b"x" * 10)
+
+    assert sorted(os.listdir(tmp_path)) == ["2.jpg", "3.jpg"]
+    assert disco.rotados == 2
+    assert disco.bytes_usados == 20
+
+
+def test_directorio_rota_por_bytes(tmp_path):
+    disco = DirectorioRotativo(str(tmp_path), max_mb=1, escribir=escribir_bytes)
+    medio_mb = b"x" * (512 * 1024)
+    for i in range(3):
+        disco.guardar(str(tmp_path / f"{i}.jpg"), medio_mb)
+
+    assert sorted(os.listdir(tmp_path)) == ["1.jpg", "2.jpg"]
+    assert disco.bytes_usados <= disco.max_bytes
+
+
+def test_directorio_sin_limite_no_registra(tmp_path):
+    disco = DirectorioRotativo(str(tmp_path), escribir=escribir_bytes)
+    for i in range(3):
+        disco.guardar(str(tmp_path / f"{i}.jpg"), b"x")
+
+    assert len(os.listdir(tmp_path)) == 3
+    assert not disco.archivos
+
+
+def test_vigilante_tasa_de_descartes():
+    muestra = {'ofrecidos': 0, 'descartados': 0}
+    vigilante = Vigilante(lambda: dict(muestra), vigilar_descartes={'frames': ('ofrecidos', 'descartados')})
+    vigilante.reportar()
+    muestra.update(ofrecidos=100, descartados=20)
+    vigilante.reportar()
+
+    assert vigilante.tasas_descartes() == {'frames': 0.2}
+
+    # Contadores reiniciados (nueva sesión): no se calcula tasa
+    muestra.update(ofrecidos=10, descartados=0)
+    vigilante.reportar()
+    assert vigilante.tasas_descartes() == {}
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("aiohttp")
+
+from detector.servidor import MicroLotes
+
+
+def ejecutar(lotes, corrutina):
+    async def principal():
+        lotes_ = lotes()
+        lotes_.iniciar()
+        try:
+            return await corrutina(lotes_)
+        finally:
+            await lotes_.detener()
+    return asyncio.run(principal())
+
+
+def test_agrupa_peticiones_concurrentes():
+    llamadas = []
+
+    def procesar(items):
+        llamadas.append(list(items))
+        return [item * 2 for item in items]
+
+    resultados = ejecutar(
+        lambda: MicroLotes(procesar, max_lote=4, max_espera_ms=50),
+        lambda lotes: asyncio.gather(*(lotes.enviar(i) for i in range(6))))
+
+    assert resultados == [0, 2, 4, 6, 8, 10]
+    assert [len(lote) for lote in llamadas] == [4, 2]
+
+
+def test_error_del_lote_llega_a_cada_peticion():
+    def procesar(items):
+        raise RuntimeError("modelo caído")
+
+    async def enviar(lotes):
+        return await asyncio.gather(lotes.enviar(1), lotes.enviar(2), return_exceptions=True)
+
+    errores = ejecutar(lambda: MicroLotes(procesar), enviar)
+
+    assert all(isinstance(e, RuntimeError) for e in errores)
+
+
+def test_timeout_por_peticion():
+    def procesar(items):
+        time.sleep(0.2)
+        return items
+
+    with pytest.raises(asyncio.TimeoutError):
+        ejecutar(lambda: MicroLotes(procesar, timeout_s=0.05), lambda lotes: lotes.enviar(1))
+
+
+def test_peticiones_vencidas_no_se_procesan():
+    llamadas = []
+
+    def procesar(items):
+        llamadas.append(list(items))
+        time.sleep(0.1)
+        return items
+
+    async def enviar(lotes):
+        primera = asyncio.ensure_future(lotes.enviar(1))
+        await asyncio.sleep(0.02)  # La segunda espera en la cola mientras se procesa la primera
+        errores = await asyncio.gather(primera, lotes.enviar(2), return_exceptions=True)
+        await asyncio.sleep(0.1)
+        return errores
+
+    errores = ejecutar(lambda: MicroLotes(procesar, max_espera_ms=0, timeout_s=0.05), enviar)
+
+    assert all(isinstance(e, asyncio.TimeoutError) for e in errores)
+    assert llamadas == [[1]]
+
+
+def test_cola_llena_rechaza():
+    liberar = threading.Event()
+
+    async def principal():
+        lotes = MicroLotes(lambda items: liberar.wait(1) and items,
+                           max_lote=1, max_espera_ms=0, max_pendientes=1)
+        lotes.iniciar()
+        primera = asyncio.ensure_future(lotes.enviar(1))
+        await asyncio.sleep(0.05)  # La primera queda bloqueada en el modelo
+        segunda = asyncio.ensure_future(lotes.enviar(2))
+        await asyncio.sleep(0)  # La segunda ocupa el único lugar de la cola
+        try:
+            with pytest.raises(asyncio.QueueFull):
+                await lotes.enviar(3)
+        finally:
+            liberar.set()
+            assert await asyncio.gather(primera, segunda) == [1, 2]
+            await lotes.detener()
+
+    asyncio.run(principal())